@@ -0,0 +1,257 @@
+# Import Helper Functions From Python Libraries
+from openpyxl import Workbook
+import argparse, ast, importlib.util, json, os, random, re, shutil, subprocess, sys, tempfile
+
+# =============================================================================
+# CONFIGURATION SECTION - Easy to modify mappings and settings
+# =============================================================================
+
+REFRESH_SCRIPT = 'Refresh Dashboard Dataset.py'
+
+# Scale points: every combination of branch count and fiscal year count is timed
+BRANCH_COUNTS = [5, 20, 100]
+YEAR_COUNTS = [1, 5, 15]
+FIRST_FISCAL_YEAR = 2010
+
+# Each scale point is refreshed twice in a fresh Dashboard folder: a first run with no manifest or cache,
+# then a repeat run with nothing changed, which is what INCREMENTAL_REFRESH and EXTRACT_CACHE speed up.
+# Every run is a separate Python process running a copy of the refresh script with the benchmark's settings
+# written into it, so PARALLEL_EXTRACTION's worker processes start exactly as they do for staff.
+RUNS = ['first', 'repeat']
+BENCHMARK_SCRIPT = 'Benchmarked Refresh.py'
+
+AGE_GROUPS = ['Birth-5', '6-11', '12-17', 'Adults', 'Seniors', 'All Ages']
+
+# =============================================================================
+# UTILITY FUNCTIONS
+# =============================================================================
+
+def apply_settings(source, settings):
+    """
+    Return the refresh script's source with each setting's line in the CONFIGURATION SECTION replaced by
+    'NAME = value'. Only settings written on a single line can be overridden.
+    """
+    for name, value in settings.items():
+        match = re.search(rf'^{re.escape(name)} = .*$', source, re.MULTILINE)
+        if not match:
+            raise ValueError(f"{REFRESH_SCRIPT} has no setting named {name}")
+        try:
+            ast.parse(match.group(0))
+        except SyntaxError:
+            raise ValueError(f"{name} spans several lines in {REFRESH_SCRIPT} and can't be set from the benchmark")
+        source = source[:match.start()] + f"{name} = {value!r}" + source[match.end():]
+    return source
+
+def write_refresh_script(settings, folder):
+    """
+    Write a copy of Refresh Dashboard Dataset.py with the given settings to folder and import it, for the
+    configuration mappings the synthetic workbooks are laid out from. The run report is always written,
+    since the timings are read from it, and watch mode is always off.
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), REFRESH_SCRIPT)) as f:
+        source = apply_settings(f.read(), dict(settings, REFRESH_REPORT=True, WATCH_MODE=False))
+
+    script_path = os.path.join(folder, BENCHMARK_SCRIPT)
+    with open(script_path, 'w') as f:
+        f.write(source)
+
+    spec = importlib.util.spec_from_file_location('benchmarked_refresh', script_path)
+    refresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(refresh)
+    return refresh, script_path
+
+def parse_setting(setting):
+    """Turn 'NAME=VALUE' into (NAME, value), reading the value as a Python literal (True, 4, 'text')."""
+    name, _, value = setting.partition('=')
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE with a Python literal value, got {setting!r}")
+
+def get_fiscal_year_folder(start_year):
+    """Return the folder name for the fiscal year starting in October of start_year."""
+    return f"October {start_year} - September {start_year + 1}"
+
+def set_cells(sheet, cell_indexes, values):
+    """Write values to compiled (row, col) indexes."""
+    for (row, col), value in zip(cell_indexes, values):
+        sheet.cell(row=row, column=col, value=value)
+
+def random_counts(rng, count, high=500):
+    """Return a list of random whole-number counts."""
+    return [rng.randint(0, high) for _ in range(count)]
+
+# =============================================================================
+# SYNTHETIC WORKBOOK GENERATION
+# =============================================================================
+
+def create_month_workbook():
+    """Create an empty workbook with one worksheet per month, October to September."""
+    wb = Workbook()
+    wb.remove(wb.active)
+    return wb
+
+def create_branch_workbook(refresh, layout, location, rng, path):
+    """Create a branch workbook laid out like 'Template for Branches.xlsx'."""
+    wb = create_month_workbook()
+    for month_name in refresh.MONTHS:
+        sheet = wb.create_sheet(month_name)
+        set_cells(sheet, [layout.branch_location], [location])
+        set_cells(sheet, layout.general_statistics, random_counts(rng, len(layout.general_statistics)))
+
+        for category, age_groups in layout.programming:
+            for age_group, (age_group_cell, groups_cell, attendance_cell) in zip(AGE_GROUPS, age_groups):
+                set_cells(sheet, [age_group_cell, groups_cell, attendance_cell],
+                          [age_group, rng.randint(0, 20), rng.randint(0, 400)])
+
+        set_cells(sheet, layout.non_library_use, random_counts(rng, len(layout.non_library_use)))
+    wb.save(path)
+
+def create_system_workbooks(refresh, layout, locations, rng, folder_path):
+    """Create the ILL, Digital Information, Tech Statistics and Summary Usage Report workbooks."""
+    # ILL: one borrowed and one supplied row across the twelve months
+    wb = Workbook()
+    set_cells(wb.active, layout.ill_borrowed, random_counts(rng, len(layout.ill_borrowed)))
+    set_cells(wb.active, layout.ill_supplied, random_counts(rng, len(layout.ill_supplied)))
+    wb.save(os.path.join(folder_path, 'ILL.xlsx'))
+
+    wb = create_month_workbook()
+    for month_name in refresh.MONTHS:
+        sheet = wb.create_sheet(month_name)
+        set_cells(sheet, layout.digital_info, random_counts(rng, len(layout.digital_info), high=50000))
+    wb.save(os.path.join(folder_path, 'Digital Information.xlsx'))
+
+    # Tech Statistics and Summary Usage Report: one row per location, ending with a 'Total' row
+    wb = create_month_workbook()
+    for month_name in refresh.MONTHS:
+        sheet = wb.create_sheet(month_name)
+        row = refresh.TECH_STATS_FIRST_ROW
+        for location in locations:
+            sheet.cell(row=row, column=layout.location_column, value=location)
+            set_cells(sheet, [(row, col) for col in layout.tech_stats_columns],
+                      random_counts(rng, len(layout.tech_stats_columns), high=20000))
+            row += 1
+        sheet.cell(row=row, column=layout.location_column, value='Total')
+        set_cells(sheet, layout.tech_stats_pt2, random_counts(rng, len(layout.tech_stats_pt2), high=20000))
+    wb.save(os.path.join(folder_path, 'Tech Statistics.xlsx'))
+
+    wb = create_month_workbook()
+    usage_rows = refresh.USAGE_ROW_LIMIT - refresh.USAGE_FIRST_ROW - 1
+    for month_name in refresh.MONTHS:
+        sheet = wb.create_sheet(month_name)
+        row = refresh.USAGE_FIRST_ROW
+        for location in locations[:usage_rows]:
+            sheet.cell(row=row, column=layout.location_column, value=location)
+            set_cells(sheet, [(row, col) for col in layout.usage_columns],
+                      random_counts(rng, len(layout.usage_columns)))
+            row += 1
+        sheet.cell(row=row, column=layout.location_column, value='Total')
+    wb.save(os.path.join(folder_path, 'Summary Usage Report.xlsx'))
+
+def generate_dataset(refresh, root, branch_count, year_count, seed=0):
+    """
+    Generate year_count fiscal-year folders under root, each with branch_count branch workbooks
+    and the four system-wide workbooks. Each branch workbook is generated once and copied into every year.
+    Folders that already exist are kept, so a root can be grown from a smaller year count.
+    """
+    rng = random.Random(seed)
+    layout = refresh.compile_layout()
+    locations = [f"Synthetic {index + 1}" for index in range(branch_count)]
+
+    template_folder = os.path.join(root, 'Branch Templates')
+    if not os.path.isdir(template_folder):
+        os.makedirs(template_folder)
+        for location in locations:
+            create_branch_workbook(refresh, layout, location, rng,
+                                   os.path.join(template_folder, f"{location} Branch.xlsx"))
+
+    for start_year in range(FIRST_FISCAL_YEAR, FIRST_FISCAL_YEAR + year_count):
+        folder_path = os.path.join(root, get_fiscal_year_folder(start_year))
+        if os.path.isdir(folder_path):
+            continue
+        os.makedirs(folder_path)
+        for location in locations:
+            filename = f"{location} Branch.xlsx"
+            shutil.copyfile(os.path.join(template_folder, filename), os.path.join(folder_path, filename))
+        create_system_workbooks(refresh, layout, locations, rng, folder_path)
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def time_refresh(refresh, script_path, root, dashboard_name):
+    """
+    Run the refresh script in its own process from a new Dashboard folder under root, once per entry in RUNS,
+    and return each run's report from Refresh Report.json.
+    """
+    dashboard_folder = os.path.join(root, dashboard_name)
+    os.makedirs(dashboard_folder)
+    shutil.copyfile(script_path, os.path.join(dashboard_folder, BENCHMARK_SCRIPT))
+    reports = {}
+
+    for run in RUNS:
+        # The newline answers the script's closing "Press Enter to exit..."
+        result = subprocess.run([sys.executable, BENCHMARK_SCRIPT], cwd=dashboard_folder, input='\n',
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"The {run} refresh of {dashboard_name} failed:\n{result.stdout}{result.stderr}")
+        with open(os.path.join(dashboard_folder, refresh.REFRESH_REPORT_FILE)) as f:
+            reports[run] = json.load(f)
+
+    return reports
+
+def sum_phases(phases, names):
+    """Add up the seconds of the named phases a report recorded (phases that didn't run count as 0)."""
+    return sum(phases.get(name, 0.0) for name in names)
+
+def sum_file_seconds(files, name):
+    """Add up one timing ('load_seconds' or 'extract_seconds') over the workbooks a report extracted."""
+    return sum(stats.get(name, 0.0) for stats in files.values() if stats['status'] == 'processed')
+
+def run_benchmark(branch_counts, year_counts, settings=None, output_path=None):
+    """Generate synthetic data for every scale point, run the refresh on it and print a summary table."""
+    results = []
+
+    # Load and Extract add up each extracted workbook's own times (across all workers with PARALLEL_EXTRACTION),
+    # the other columns are the refresh's phases
+    print(f"{'Branches':>8} {'Years':>5} {'Run':>6} {'Files':>6} {'Extracted':>9} {'Rows':>8} {'Scan (s)':>9} "
+          f"{'Load (s)':>9} {'Extract (s)':>11} {'Save (s)':>9} {'Total (s)':>9}")
+    for branch_count in branch_counts:
+        with tempfile.TemporaryDirectory() as root:
+            refresh, script_path = write_refresh_script(settings or {}, root)
+            for year_count in sorted(year_counts):
+                generate_dataset(refresh, root, branch_count, year_count)
+                reports = time_refresh(refresh, script_path, root, f"Dashboard {year_count} Years")
+
+                for run, report in reports.items():
+                    phases = report['phases']
+                    files = len(report['files'])
+                    extracted = sum(1 for stats in report['files'].values() if stats['status'] == 'processed')
+                    rows = sum(report['rows'].values())
+                    scan = sum_phases(phases, ['Scan folders'])
+                    load = sum_file_seconds(report['files'], 'load_seconds')
+                    extract = sum_file_seconds(report['files'], 'extract_seconds')
+                    save = sum_phases(phases, ['Save MasterDataset.xlsx'])
+                    print(f"{branch_count:>8} {year_count:>5} {run:>6} {files:>6} {extracted:>9} {rows:>8} {scan:>9.2f} "
+                          f"{load:>9.2f} {extract:>11.2f} {save:>9.2f} {report['total_seconds']:>9.2f}")
+                    results.append({'branches': branch_count, 'years': year_count, 'run': run, 'files': files,
+                                    'extracted': extracted, 'rows': rows, 'phases': phases,
+                                    'total': report['total_seconds'], 'settings': report['settings']})
+
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved benchmark results to {output_path}")
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the dashboard refresh on synthetic fiscal-year folders.")
+    parser.add_argument('--branches', type=int, nargs='+', default=BRANCH_COUNTS, help="Branch counts to test")
+    parser.add_argument('--years', type=int, nargs='+', default=YEAR_COUNTS, help="Fiscal year counts to test")
+    parser.add_argument('--set', type=parse_setting, action='append', default=[], metavar='NAME=VALUE',
+                        help="Override a refresh setting, e.g. --set PARALLEL_EXTRACTION=True (repeatable)")
+    parser.add_argument('--output', help="Save the results as JSON to this file")
+    args = parser.parse_args()
+
+    run_benchmark(args.branches, args.years, dict(args.set), args.output)
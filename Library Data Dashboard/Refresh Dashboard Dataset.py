@@ -1,6 +1,13 @@
 # Import Helper Functions From Python Libraries
 from openpyxl import load_workbook, Workbook
 import os, re
+import hashlib, json, pickle, sqlite3, tempfile
+from datetime import datetime
+from time import monotonic, perf_counter, sleep
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from openpyxl.utils.cell import range_boundaries
 
 # =============================================================================
 # CONFIGURATION SECTION - Easy to modify mappings and settings
@@ -11,7 +18,52 @@ MONTHS = ["October", "November", "December", "January", "February", "March",
 
 EXPECTED_FILES = ['ILL.xlsx', 'Digital Information.xlsx', 'Tech Statistics.xlsx', 'Summary Usage Report.xlsx']
 
+# Incremental refresh: only re-extract workbooks whose size, modified time or contents changed
+# since the last run. Rows for unchanged workbooks are reused from the manifest file, and any
+# rows they had rejected as non-numerical are reported again.
+INCREMENTAL_REFRESH = True
+MANIFEST_FILE = 'Refresh Manifest.pkl'
+MANIFEST_VERSION = 3
+
+# Extraction cache: keep the rows (and rejected rows) extracted from each workbook's contents in EXTRACT_CACHE_FOLDER, so a
+# workbook seen before (in any folder, even after the manifest is lost) is never parsed twice.
+# The least recently used entries are removed once the folder is larger than EXTRACT_CACHE_MAX_MB.
+EXTRACT_CACHE = False
+EXTRACT_CACHE_FOLDER = 'Refresh Cache'
+EXTRACT_CACHE_MAX_MB = 200
+
+# Parallel extraction: read workbooks in separate processes (one per CPU core unless MAX_WORKERS is set)
+PARALLEL_EXTRACTION = False
+MAX_WORKERS = None
+
+# Read-only extraction: stream only the cells each extractor needs instead of loading whole workbooks
+READ_ONLY_EXTRACTION = True
+
+# Parquet output: also write each worksheet as a typed Parquet file (requires: pip install pyarrow)
+PARQUET_OUTPUT = False
+PARQUET_FOLDER = 'MasterDataset Parquet'
+
+# SQLite store: keep every worksheet in an indexed SQLite database and export MasterDataset.xlsx from it.
+# Each row is keyed on the workbook it came from and its position there, so re-extracted workbooks
+# replace exactly their own rows. Values are stored as extracted, so the export matches a normal refresh.
+SQLITE_STORE = False
+SQLITE_STORE_FILE = 'MasterDataset.sqlite'
+SQLITE_STORE_VERSION = 3
+
+# Watch mode: after refreshing, keep checking the fiscal-year folders every WATCH_INTERVAL_SECONDS and
+# refresh again once a changed workbook has gone WATCH_DEBOUNCE_SECONDS without changes and is closed in Excel
+WATCH_MODE = False
+WATCH_INTERVAL_SECONDS = 30
+WATCH_DEBOUNCE_SECONDS = 60
+
+# Run report: timings per file, sheet and phase, rows per worksheet and rejected rows, saved as JSON
+REFRESH_REPORT = True
+REFRESH_REPORT_FILE = 'Refresh Report.json'
+PRINT_REFRESH_SUMMARY = False
+
 # Cell mappings for different data types
+BRANCH_LOCATION_CELL = 'B4'
+
 GENERAL_STATISTICS_CELLS = {
     'Total Patrons': 'F8',
     'Volunteers Hours': 'F10',
@@ -60,6 +112,11 @@ TECH_STATS_CELLS = {
     'New Library Card Holders': 'U'
 }
 
+# Tech Statistics and Summary Usage Report list one location per row in this column, ending with 'Total'
+LOCATION_COLUMN = 'B'
+TECH_STATS_FIRST_ROW = 5
+TECH_STATS_PT2_CELLS = 'AA4:AA8'
+
 # Computer & Study Room Usage
 USAGE_CELLS = {
     # Row numbers will be added dynamically
@@ -75,6 +132,9 @@ USAGE_CELLS = {
     'Meeting-Group Room Number Of Rooms': 'AF'
 }
 
+USAGE_FIRST_ROW = 7
+USAGE_ROW_LIMIT = 30  # Rows from here down are never read
+
 ILL_CELLS = {
     'Borrowed': 'C5:N5',
     'Supplied': 'C6:N6'
@@ -82,6 +142,12 @@ ILL_CELLS = {
 
 PROGRAMMING_CATEGORIES = ["In-House", "Outreach", "Virtual", "Self-Directed"]
 
+# Each category block starts 9 rows below the last: age groups on the first row,
+# then (groups, attendance) column pairs two rows below
+PROGRAMMING_FIRST_ROW = 39
+PROGRAMMING_ROW_SPACING = 9
+PROGRAMMING_COLUMNS = ['H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S']
+
 NON_LIBRARY_USE_CELLS = {
     'Total Groups': 'H34',
     'Total Attendance': 'K34'
@@ -124,10 +190,23 @@ WORKSHEET_COLUMNS = {
     'Branch Legend': ['Name', 'Location']
 }
 
+# Column types for the Parquet output. Any column not listed here is a whole-number count.
+TEXT_COLUMNS = ['Location', 'Month Name', 'Category', 'Age Group', 'Name']
+DATE_COLUMNS = ['Date']
+DECIMAL_COLUMNS = ['Volunteers Hours', 'Volunteens Hours', 'Subtotal Hours Worked', 'Public Service Hours',
+                   'Total Hours', 'Paid Non-Library Staff Hours', 'Staff Hours', 'Hours With Patrons',
+                   'Hours Open Total', 'Avg Hold Time', 'Study Room Hours Booked', 'Meeting-Group Room Hours Booked']
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+def find_fiscal_year_folders(parent_directory):
+    """Return the sorted 'October YYYY - September YYYY' folders in the parent directory."""
+    return sorted(folder for folder in os.listdir(parent_directory) 
+                  if (os.path.isdir(os.path.join(parent_directory, folder)) and 
+                      re.match(r"^October 2\d{3} - September 2\d{3}$", folder)))
+
 def detect_branch_files(folder_path):
     """Detect all Excel files ending with 'Branch.xlsx' and create branch legend data."""
     branch_files = []
@@ -180,7 +259,9 @@ def safe_append_library_row(worksheet, row, location, month_name, year, data_typ
         clean_row = clean_data_row(row, skip_columns)
         worksheet.append(clean_row)
     except Exception as e:
-        print(f"{data_type} in {location} {month_name} {year}: {e}")
+        message = f"{data_type} in {location} {month_name} {year}: {e}"
+        print(message)
+        record_rejection(data_type, message)
 
 def safe_append_row(worksheet, row, month_name, year, data_type, skip_columns=4):
     """Safely append a row to worksheet with error handling."""
@@ -188,27 +269,24 @@ def safe_append_row(worksheet, row, month_name, year, data_type, skip_columns=4)
         clean_row = clean_data_row(row, skip_columns)
         worksheet.append(clean_row)
     except Exception as e:
-        print(f"{data_type} in {month_name} {year}: {e}")
+        message = f"{data_type} in {month_name} {year}: {e}"
+        print(message)
+        record_rejection(data_type, message)
 
 # =============================================================================
 # WORKSHEET CREATION AND SETUP
 # =============================================================================
 
 def create_master_dataset():
-    """Create the master workbook with all required worksheets and headers."""
-    new_wb = Workbook()
+    """
+    Create the master workbook with all required worksheets and headers.
+    The workbook is write-only, so appended rows are streamed to disk instead of kept in memory.
+    """
+    new_wb = Workbook(write_only=True)
     
     # Create worksheets
     worksheets = {}
-    ws_names = list(WORKSHEET_COLUMNS.keys())
-    
-    # First worksheet (active)
-    ws1 = new_wb.active
-    ws1.title = ws_names[0]
-    worksheets[ws_names[0]] = ws1
-    
-    # Create remaining worksheets
-    for ws_name in ws_names[1:]:
+    for ws_name in WORKSHEET_COLUMNS:
         worksheets[ws_name] = new_wb.create_sheet(ws_name)
     
     # Add column headers to each worksheet
@@ -217,41 +295,298 @@ def create_master_dataset():
     
     return new_wb, worksheets
 
+def save_master_dataset(dataset_rows, path='MasterDataset.xlsx'):
+    """
+    Write every worksheet's rows to a new master dataset workbook without ever removing the old one.
+    The rows are streamed into a temporary workbook in the same folder, which is reopened to check
+    every worksheet's row count and only then renamed over the old file in one step.
+    """
+    folder_path = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = tempfile.mkstemp(prefix='MasterDataset-', suffix='.xlsx', dir=folder_path)
+    os.close(file_descriptor)
+
+    try:
+        new_wb, worksheets = create_master_dataset()
+        for ws_name, rows in dataset_rows.items():
+            for row in rows:
+                worksheets[ws_name].append(row)
+        new_wb.save(temp_path)
+
+        validate_master_dataset(temp_path, dataset_rows)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return worksheets
+
+def validate_master_dataset(path, dataset_rows):
+    """Reopen a saved master dataset and check each worksheet has its header plus every row."""
+    wb = load_workbook(path, read_only=True)
+    try:
+        for ws_name, rows in dataset_rows.items():
+            if ws_name not in wb.sheetnames:
+                raise ValueError(f"Saved dataset is missing the {ws_name} worksheet")
+            row_count = sum(1 for _ in wb[ws_name].iter_rows(values_only=True))
+            if row_count != len(rows) + 1:
+                raise ValueError(f"Saved dataset has {row_count - 1} rows in {ws_name}, expected {len(rows)}")
+    finally:
+        wb.close()
+
 def populate_legend_worksheets(worksheets, branch_legend_data):
     """Populate the Branch Legend and Age Group Legend worksheets."""
     # Populate Branch Legend
     for branch_data in branch_legend_data:
         worksheets['Branch Legend'].append(branch_data)
 
+# =============================================================================
+# CELL MAP COMPILER
+# =============================================================================
+
+CompiledLayout = namedtuple('CompiledLayout', [
+    'branch_location', 'general_statistics', 'little_discovery', 'programming', 'non_library_use',
+    'digital_info', 'ill_borrowed', 'ill_supplied', 'location_column', 'tech_stats_columns',
+    'tech_stats_pt2', 'usage_columns'])
+
+def compile_cells(coordinate):
+    """Turn a cell ('F8') or range ('C5:N5') into a tuple of (row, col) indexes, row by row."""
+    min_col, min_row, max_col, max_row = range_boundaries(coordinate)
+    return tuple((row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1))
+
+def compile_cell_map(cell_map):
+    """Turn a {metric: 'F8'} mapping into (row, col) indexes in metric order."""
+    return tuple(index for cell in cell_map.values() for index in compile_cells(cell))
+
+def compile_column(column):
+    """Turn a column letter ('AB') into its column index."""
+    return range_boundaries(f"{column}1")[0]
+
+@lru_cache(maxsize=None)
+def compile_layout():
+    """Compile the configuration mappings once into the (row, col) indexes every extractor reads."""
+    # Programming: one (age group, total groups, total attendance) index triple per age group column pair
+    programming = []
+    for index, category in enumerate(PROGRAMMING_CATEGORIES):
+        row_number = PROGRAMMING_FIRST_ROW + (index * PROGRAMMING_ROW_SPACING)
+        columns = [compile_column(column) for column in PROGRAMMING_COLUMNS]
+        age_groups = tuple(((row_number, columns[col_index]), (row_number + 2, columns[col_index]),
+                            (row_number + 2, columns[col_index + 1]))
+                           for col_index in range(0, len(columns), 2))
+        programming.append((category, age_groups))
+
+    return CompiledLayout(
+        branch_location=compile_cells(BRANCH_LOCATION_CELL)[0],
+        general_statistics=compile_cell_map(GENERAL_STATISTICS_CELLS),
+        little_discovery=compile_cell_map(LITTLE_DISCOVERY_CELLS),
+        programming=tuple(programming),
+        non_library_use=compile_cell_map(NON_LIBRARY_USE_CELLS),
+        digital_info=compile_cell_map(DIGITAL_INFO_CELLS),
+        ill_borrowed=compile_cells(ILL_CELLS['Borrowed']),
+        ill_supplied=compile_cells(ILL_CELLS['Supplied']),
+        location_column=compile_column(LOCATION_COLUMN),
+        tech_stats_columns=tuple(compile_column(column) for column in TECH_STATS_CELLS.values()),
+        tech_stats_pt2=compile_cells(TECH_STATS_PT2_CELLS),
+        usage_columns=tuple(compile_column(column) for column in USAGE_CELLS.values()))
+
+def get_cell_value(sheet, row, col):
+    """Return the value of one cell from a worksheet or SheetValues."""
+    if isinstance(sheet, SheetValues):
+        return sheet.value_at(row, col)
+    return sheet.cell(row=row, column=col).value
+
+def gather_cells(sheet, cell_indexes):
+    """Return the values at each compiled (row, col) index, in order."""
+    if isinstance(sheet, SheetValues):
+        return [sheet.value_at(row, col) for row, col in cell_indexes]
+    return [sheet.cell(row=row, column=col).value for row, col in cell_indexes]
+
+def gather_row(sheet, row, columns):
+    """Return the values in the given columns of one row."""
+    return gather_cells(sheet, [(row, col) for col in columns])
+
+# =============================================================================
+# RUN REPORT
+# =============================================================================
+
+# Timings and rejected rows for the workbook being extracted (kept per process when extracting in parallel)
+current_file_stats = {}
+
+def start_file_stats():
+    """Start collecting timings and rejected rows for a new source workbook."""
+    global current_file_stats
+    current_file_stats = {'load_seconds': 0.0, 'extract_seconds': 0.0, 'sheets': {}, 'rejections': {},
+                          'rejection_messages': []}
+    return current_file_stats
+
+def record_sheet_time(sheet_name, sheet_start):
+    """Record how long one worksheet took to extract."""
+    current_file_stats.setdefault('sheets', {})[sheet_name] = perf_counter() - sheet_start
+
+def record_rejection(data_type, message):
+    """Count a row that clean_data_row rejected and keep its message, so it can be shown again when the rows are reused."""
+    rejections = current_file_stats.setdefault('rejections', {})
+    rejections[data_type] = rejections.get(data_type, 0) + 1
+    current_file_stats.setdefault('rejection_messages', []).append(message)
+
+def build_refresh_report(started, phases, file_stats, dataset_rows):
+    """
+    Combine the phase timings, per-file stats and worksheet row counts into one report.
+    Rejected rows are counted for every source workbook, including those whose rows were reused.
+    """
+    rejections = {}
+    for stats in file_stats.values():
+        for data_type, count in stats.get('rejections', {}).items():
+            rejections[data_type] = rejections.get(data_type, 0) + count
+
+    return {
+        'started': started.isoformat(timespec='seconds'),
+        'total_seconds': sum(phases.values()),
+        'settings': {'incremental_refresh': INCREMENTAL_REFRESH, 'parallel_extraction': PARALLEL_EXTRACTION,
+                     'read_only_extraction': READ_ONLY_EXTRACTION, 'extract_cache': EXTRACT_CACHE,
+                     'parquet_output': PARQUET_OUTPUT,
+                     'sqlite_store': SQLITE_STORE},
+        'phases': phases,
+        'files': file_stats,
+        'rows': {ws_name: len(rows) for ws_name, rows in dataset_rows.items()},
+        'rejections': rejections,
+        'total_rejections': sum(rejections.values())
+    }
+
+def write_refresh_report(report):
+    """Save the run report as JSON next to MasterDataset.xlsx, and print a summary if requested."""
+    if not REFRESH_REPORT:
+        return
+
+    with open(REFRESH_REPORT_FILE, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved run report to {REFRESH_REPORT_FILE}")
+
+    if PRINT_REFRESH_SUMMARY:
+        print_refresh_summary(report)
+
+def print_refresh_summary(report):
+    """Print the phase timings, slowest workbooks, worksheet row counts and rejected rows."""
+    print(f"\n{'Phase':<30} {'Seconds':>10}")
+    for phase, seconds in report['phases'].items():
+        print(f"{phase:<30} {seconds:>10.2f}")
+
+    processed = [(stats['load_seconds'] + stats['extract_seconds'], key)
+                 for key, stats in report['files'].items() if stats['status'] == 'processed']
+    if processed:
+        print(f"\n{'Slowest Workbooks':<60} {'Seconds':>10}")
+        for seconds, key in sorted(processed, reverse=True)[:10]:
+            print(f"{key:<60} {seconds:>10.2f}")
+
+    print(f"\n{'Worksheet':<30} {'Rows':>10}")
+    for ws_name, count in report['rows'].items():
+        print(f"{ws_name:<30} {count:>10}")
+
+    print(f"\nRejected rows: {report['total_rejections']}")
+    for data_type, count in report['rejections'].items():
+        print(f"  {data_type}: {count}")
+
+# =============================================================================
+# READ-ONLY STREAMING CELL ACCESS
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def get_cell_requirements(sheet_type):
+    """
+    Return the (cells, columns, max_row) each type of worksheet is read with.
+    Cells are (row, col) indexes; columns are read on every row up to max_row (None reads to the end).
+    """
+    layout = compile_layout()
+
+    if sheet_type == 'branch':
+        cells = {layout.branch_location}
+        cells.update(layout.general_statistics, layout.little_discovery, layout.non_library_use)
+        for category, age_groups in layout.programming:
+            cells.update(index for age_group in age_groups for index in age_group)
+        return frozenset(cells), frozenset(), None
+
+    if sheet_type == 'digital info':
+        return frozenset(layout.digital_info), frozenset(), None
+
+    if sheet_type == 'ill':
+        return frozenset(layout.ill_borrowed + layout.ill_supplied), frozenset(), None
+
+    if sheet_type == 'tech stats':
+        columns = frozenset((layout.location_column,) + layout.tech_stats_columns)
+        return frozenset(layout.tech_stats_pt2), columns, None
+
+    if sheet_type == 'usage':
+        columns = frozenset((layout.location_column,) + layout.usage_columns)
+        return frozenset(), columns, USAGE_ROW_LIMIT - 1
+
+    raise ValueError(f"Unknown sheet type: {sheet_type}")
+
+class SheetValues:
+    """
+    The cell values an extractor needs from one worksheet, read in a single streaming pass.
+    """
+
+    def __init__(self, sheet, cells, columns, max_row):
+        self.title = sheet.title
+        self.cells = cells
+        self.columns = columns
+
+        # Only stream as far down and across as the furthest cell needed
+        if cells and max_row is not None:
+            max_row = max(max_row, max(row for row, col in cells))
+        elif cells and not columns:
+            max_row = max(row for row, col in cells)
+        max_col = max([col for row, col in cells] + list(columns))
+
+        if max_row is None:
+            sheet.reset_dimensions()  # Don't trust the saved sheet size when reading to the end
+
+        cells_by_row = {}
+        for row, col in cells:
+            cells_by_row.setdefault(row, []).append(col)
+
+        self.values = {}
+        for row_number, row in enumerate(sheet.iter_rows(min_row=1, max_row=max_row, max_col=max_col,
+                                                         values_only=True), start=1):
+            for col in columns.union(cells_by_row.get(row_number, ())):
+                if col <= len(row) and row[col - 1] is not None:
+                    self.values[(row_number, col)] = row[col - 1]
+
+    def value_at(self, row, col):
+        """Return a cell value, or raise KeyError if the cell was not part of the streaming pass."""
+        if col not in self.columns and (row, col) not in self.cells:
+            raise KeyError(f"Cell ({row}, {col}) was not read from {self.title}")
+        return self.values.get((row, col))
+
+def read_sheet(sheet, sheet_type):
+    """Return the worksheet itself, or just the cells its extractor needs when READ_ONLY_EXTRACTION is on."""
+    if not READ_ONLY_EXTRACTION:
+        return sheet
+    cells, columns, max_row = get_cell_requirements(sheet_type)
+    return SheetValues(sheet, cells, columns, max_row)
+
 # =============================================================================
 # DATA EXTRACTION FUNCTIONS
 # =============================================================================
 
 def extract_general_statistics(sheet, location, month_name, year, date):
     """Extract general statistics data from a library worksheet."""
+    layout = compile_layout()
     if location == "Little Discovery Center":  # Little Discovery Center special case
-        total_patrons = sheet[LITTLE_DISCOVERY_CELLS['Total Patrons']].value
-        return [location, date, month_name, year, total_patrons] + [0] * 16
+        total_patrons = gather_cells(sheet, layout.little_discovery)[0]
+        return [location, date, month_name, year, total_patrons] + [0] * (len(layout.general_statistics) - 1)
     else:
         # Extract all general statistics using the cell mapping
-        row_data = [location, date, month_name, year]
-        for metric, cell in GENERAL_STATISTICS_CELLS.items():
-            row_data.append(sheet[cell].value)
-        return row_data
+        return [location, date, month_name, year] + gather_cells(sheet, layout.general_statistics)
  
 def extract_programming_data(sheet, location, month_name, year, date):
     """Extract programming data from a library worksheet."""
+    layout = compile_layout()
     programming_rows = []
     
     # Regular programming categories
-    for index, category in enumerate(PROGRAMMING_CATEGORIES):
-        row_number = 39 + (index * 9)
-        columns = ['H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S']
-        
-        for col_index in range(0, len(columns), 2):
-            age_group = sheet[columns[col_index] + str(row_number)].value
-            total_groups = sheet[columns[col_index] + str(row_number + 2)].value
-            total_attendance = sheet[columns[col_index + 1] + str(row_number + 2)].value
+    for category, age_groups in layout.programming:
+        for age_group_cells in age_groups:
+            age_group, total_groups, total_attendance = gather_cells(sheet, age_group_cells)
             
             row = [location, date, month_name, year, category, age_group, total_groups, total_attendance]
             programming_rows.append(row)
@@ -259,8 +594,7 @@ def extract_programming_data(sheet, location, month_name, year, date):
     # Non Library Use of Facilities
     category = 'Non Library Use of Facilities'
     age_group = 'N/A'
-    total_groups = sheet[NON_LIBRARY_USE_CELLS['Total Groups']].value
-    total_attendance = sheet[NON_LIBRARY_USE_CELLS['Total Attendance']].value
+    total_groups, total_attendance = gather_cells(sheet, layout.non_library_use)
     
     row = [location, date, month_name, year, category, age_group, total_groups, total_attendance]
     programming_rows.append(row)
@@ -269,15 +603,13 @@ def extract_programming_data(sheet, location, month_name, year, date):
 
 def extract_digital_info(sheet, month_name, year, date):
     """Extract digital information data from worksheet."""
-    row_data = [date, month_name, year]
-    for metric, cell in DIGITAL_INFO_CELLS.items():
-        row_data.append(sheet[cell].value)
-    return row_data
+    return [date, month_name, year] + gather_cells(sheet, compile_layout().digital_info)
 
 def extract_ill_data(sheet, start_year):
     """Extract Inter Library Loan data from worksheet."""
-    borrowed_list = [cell.value for row in sheet[ILL_CELLS['Borrowed']] for cell in row]
-    supplied_list = [cell.value for row in sheet[ILL_CELLS['Supplied']] for cell in row]
+    layout = compile_layout()
+    borrowed_list = gather_cells(sheet, layout.ill_borrowed)
+    supplied_list = gather_cells(sheet, layout.ill_supplied)
     
     ill_rows = []
     for index in range(12):
@@ -296,18 +628,14 @@ def extract_ill_data(sheet, start_year):
 
 def extract_tech_statistics(sheet, month_name, year, date):
     """Extract technology statistics from worksheet."""
+    layout = compile_layout()
     tech_rows = []
     
     # Process libraries based on detected branch files
-    index = 5
-    while sheet[f"B{index}"].value != 'Total':
-        location = sheet[f"B{index}"].value
-        check_outs = sheet[f"{TECH_STATS_CELLS['Check Outs']}{index}"].value
-        check_ins = sheet[f"{TECH_STATS_CELLS['Check Ins']}{index}"].value
-        total_volumes = sheet[f"{TECH_STATS_CELLS['Total Volumes Available']}{index}"].value
-        new_cards = sheet[f"{TECH_STATS_CELLS['New Library Card Holders']}{index}"].value
-        
-        row = [location, date, month_name, year, check_outs, check_ins, total_volumes, new_cards]
+    index = TECH_STATS_FIRST_ROW
+    while get_cell_value(sheet, index, layout.location_column) != 'Total':
+        location = get_cell_value(sheet, index, layout.location_column)
+        row = [location, date, month_name, year] + gather_row(sheet, index, layout.tech_stats_columns)
         tech_rows.append(row)
         index += 1
     
@@ -315,36 +643,25 @@ def extract_tech_statistics(sheet, month_name, year, date):
 
 def extract_computer_study_room_usage(sheet, month_name, year, date):
     """Extract technology statistics from worksheet."""
+    layout = compile_layout()
     usage_rows = []
     
     # Process libraries based on detected branch files
-    index = 7
-    while sheet[f"B{index}"].value != 'Total':
-        location = sheet[f"B{index}"].value
-        total_computer_usage = sheet[f"{USAGE_CELLS['Total Computer Usage']}{index}"].value
-        SR_hours_booked = sheet[f"{USAGE_CELLS['Study Room Hours Booked']}{index}"].value
-        SR_total_bookings = sheet[f"{USAGE_CELLS['Study Room Total Bookings']}{index}"].value
-        SR_unique_users = sheet[f"{USAGE_CELLS['Study Room Unique Users']}{index}"].value
-        SR_num_of_rooms = sheet[f"{USAGE_CELLS['Study Room Number Of Rooms']}{index}"].value
-
-        MR_hours_booked = sheet[f"{USAGE_CELLS['Meeting-Group Room Hours Booked']}{index}"].value
-        MR_total_bookings = sheet[f"{USAGE_CELLS['Meeting-Group Room Total Bookings']}{index}"].value
-        MR_unique_users = sheet[f"{USAGE_CELLS['Meeting-Group Room Unique Users']}{index}"].value
-        MR_num_of_rooms = sheet[f"{USAGE_CELLS['Meeting-Group Room Number Of Rooms']}{index}"].value
-
-        row = [location, date, month_name, year, total_computer_usage, SR_hours_booked, SR_total_bookings, 
-               SR_unique_users, SR_num_of_rooms, MR_hours_booked, MR_total_bookings,MR_unique_users, MR_num_of_rooms]
+    index = USAGE_FIRST_ROW
+    while get_cell_value(sheet, index, layout.location_column) != 'Total':
+        location = get_cell_value(sheet, index, layout.location_column)
+        row = [location, date, month_name, year] + gather_row(sheet, index, layout.usage_columns)
 
         usage_rows.append(row)
         index += 1
-        if index == 30:
+        if index == USAGE_ROW_LIMIT:
             break
 
     return usage_rows
 
 def extract_tech_statistics_pt2(sheet, month_name, year, date):
     """Extract additional tech statistics from worksheet."""
-    tech_stats_2_data = [cell.value for row in sheet["AA4:AA8"] for cell in row]
+    tech_stats_2_data = gather_cells(sheet, compile_layout().tech_stats_pt2)
     return [date, month_name, year] + tech_stats_2_data
 
 # =============================================================================
@@ -358,8 +675,9 @@ def process_library_file(wb, worksheets, filename, start_year):
             print(f"Ignored: {sheet_name} sheet from {filename}")
             continue
         
-        sheet = wb[sheet_name]
-        location = sheet["B4"].value
+        sheet_start = perf_counter()
+        sheet = read_sheet(wb[sheet_name], 'branch')
+        location = get_cell_value(sheet, *compile_layout().branch_location)
         
         if location == "Month/Year":
             location = "Little Discovery Center"
@@ -378,18 +696,22 @@ def process_library_file(wb, worksheets, filename, start_year):
                 safe_append_library_row(worksheets['Programming'], prog_row, 
                                location, sheet_name, year, "Programming", skip_columns=6)
 
+        record_sheet_time(sheet_name, sheet_start)
+
 def process_digital_info_file(wb, worksheets, start_year):
     """Process Digital Information Excel file."""
     for sheet_name in wb.sheetnames:
         if sheet_name not in MONTHS:
             continue
         
-        sheet = wb[sheet_name]
+        sheet_start = perf_counter()
+        sheet = read_sheet(wb[sheet_name], 'digital info')
         year = get_year_from_month(sheet_name, start_year)
         date = get_date_string(year, sheet_name)
         
         digital_data = extract_digital_info(sheet, sheet_name, year, date)
         safe_append_row(worksheets['Digital Information'], digital_data, sheet_name, year, "Digital Information")
+        record_sheet_time(sheet_name, sheet_start)
 
 
 def process_tech_stats_file(wb, worksheets, start_year):
@@ -398,7 +720,8 @@ def process_tech_stats_file(wb, worksheets, start_year):
         if sheet_name not in MONTHS:
             continue
         
-        sheet = wb[sheet_name]
+        sheet_start = perf_counter()
+        sheet = read_sheet(wb[sheet_name], 'tech stats')
         year = get_year_from_month(sheet_name, start_year)
         date = get_date_string(year, sheet_name)
         
@@ -411,6 +734,7 @@ def process_tech_stats_file(wb, worksheets, start_year):
         # Process tech statistics part 2
         tech_stats_2 = extract_tech_statistics_pt2(sheet, sheet_name, year, date)
         safe_append_row(worksheets['Tech Statistics pt2'], tech_stats_2, sheet_name, year, "Tech Statistics pt2")
+        record_sheet_time(sheet_name, sheet_start)
 
 def process_library_usage(wb, worksheets, start_year):
     """Process computer and study room usage data."""
@@ -418,44 +742,447 @@ def process_library_usage(wb, worksheets, start_year):
         if sheet_name not in MONTHS:
             continue
 
-        sheet = wb[sheet_name]
+        sheet_start = perf_counter()
+        sheet = read_sheet(wb[sheet_name], 'usage')
         year = get_year_from_month(sheet_name, start_year)
         date = get_date_string(year, sheet_name)
 
         computer_study_room_usage = extract_computer_study_room_usage(sheet, sheet_name, year, date)
         for usage_row in computer_study_room_usage:
             safe_append_library_row(worksheets['Computer & Study Room Usage'], usage_row, usage_row[0], sheet_name, year, "Computer & Study Room Usage")
+        record_sheet_time(sheet_name, sheet_start)
+
+def create_sheet_rows():
+    """Create an empty row list for every worksheet in the master dataset."""
+    return {ws_name: [] for ws_name in WORKSHEET_COLUMNS}
+
+def load_source_workbook(full_path):
+    """Open a source workbook for extraction."""
+    return load_workbook(full_path, data_only=True, read_only=READ_ONLY_EXTRACTION)
+
+def extract_workbook_rows(wb, filename, start_year, branch_files):
+    """Return the rows an open source workbook contributes to each worksheet."""
+    sheet_rows = create_sheet_rows()
+
+    if filename in branch_files:
+        process_library_file(wb, sheet_rows, filename, start_year)
+
+    elif filename == 'ILL.xlsx':
+        sheet = read_sheet(wb.active, 'ill')
+        ill_data = extract_ill_data(sheet, start_year)
+        for ill_row in ill_data:
+            safe_append_library_row(sheet_rows['ILL'], ill_row, 
+                           "System-wide", ill_row[1], ill_row[2], "ILL", skip_columns=3)
+
+    elif filename == 'Digital Information.xlsx':
+        process_digital_info_file(wb, sheet_rows, start_year)
+
+    elif filename == 'Tech Statistics.xlsx':
+        process_tech_stats_file(wb, sheet_rows, start_year)
+
+    elif filename == 'Summary Usage Report.xlsx':
+        process_library_usage(wb, sheet_rows, start_year)
+
+    return sheet_rows
+
+def extract_source_file(full_path, filename, start_year, branch_files):
+    """
+    Load one source workbook and return the rows it contributes to each worksheet,
+    along with its load/extract timings, per-sheet timings and rejected row counts.
+    """
+    file_stats = start_file_stats()
+
+    load_start = perf_counter()
+    wb = load_source_workbook(full_path)
+    file_stats['load_seconds'] = perf_counter() - load_start
+
+    extract_start = perf_counter()
+    sheet_rows = extract_workbook_rows(wb, filename, start_year, branch_files)
+    wb.close()
+    file_stats['extract_seconds'] = perf_counter() - extract_start
+
+    return sheet_rows, file_stats
+
+# =============================================================================
+# INCREMENTAL REFRESH
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def get_extractor_config_hash():
+    """Hash the cell mappings and worksheet layout so cached rows are discarded when they change."""
+    extractor_config = (MANIFEST_VERSION, MONTHS, EXPECTED_FILES, BRANCH_LOCATION_CELL, GENERAL_STATISTICS_CELLS,
+                        LITTLE_DISCOVERY_CELLS, DIGITAL_INFO_CELLS, TECH_STATS_CELLS, LOCATION_COLUMN,
+                        TECH_STATS_FIRST_ROW, TECH_STATS_PT2_CELLS, USAGE_CELLS, USAGE_FIRST_ROW, USAGE_ROW_LIMIT,
+                        ILL_CELLS, PROGRAMMING_CATEGORIES, PROGRAMMING_FIRST_ROW, PROGRAMMING_ROW_SPACING,
+                        PROGRAMMING_COLUMNS, NON_LIBRARY_USE_CELLS, WORKSHEET_COLUMNS)
+    return hashlib.sha256(repr(extractor_config).encode('utf-8')).hexdigest()
+
+def get_file_hash(full_path):
+    """Compute the SHA-256 hash of a file's contents."""
+    file_hash = hashlib.sha256()
+    with open(full_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+def load_manifest():
+    """Load the fingerprints and rows saved by the last refresh, or an empty manifest if they can't be used."""
+    if not INCREMENTAL_REFRESH or not os.path.exists(MANIFEST_FILE):
+        return {}
+
+    try:
+        with open(MANIFEST_FILE, 'rb') as f:
+            manifest = pickle.load(f)
+    except Exception as e:
+        print(f"Could not read {MANIFEST_FILE}, every workbook will be processed: {e}")
+        return {}
+
+    if manifest.get('config_hash') != get_extractor_config_hash():
+        print("Cell mappings changed since the last refresh, every workbook will be processed.")
+        return {}
+
+    return manifest['files']
 
-def delete_master_dataset():
-    """Remove existing master dataset file if it exists."""
-    if os.path.exists('MasterDataset.xlsx'):
-        os.remove('MasterDataset.xlsx')
-        print('Removed existing Master Dataset')
+def save_manifest(manifest_files):
+    """Save the fingerprints and rows of every processed workbook for the next refresh."""
+    if not INCREMENTAL_REFRESH:
+        return
+
+    manifest = {'config_hash': get_extractor_config_hash(), 'files': manifest_files}
+    with open(MANIFEST_FILE, 'wb') as f:
+        pickle.dump(manifest, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def find_unchanged_entry(manifest, manifest_key, full_path):
+    """
+    Return the manifest entry (rows and rejected rows) for a source workbook if it is unchanged, or None if it
+    must be extracted, along with the workbook's current fingerprint. A matching size and modified time skips
+    the file entirely; otherwise the contents are hashed so a file that was only re-saved or copied is not re-extracted.
+    """
+    if not INCREMENTAL_REFRESH:
+        return None, {}
+
+    file_stat = os.stat(full_path)
+    entry = manifest.get(manifest_key)
+
+    if entry and entry['size'] == file_stat.st_size and entry['mtime'] == file_stat.st_mtime_ns:
+        return entry, {'size': entry['size'], 'mtime': entry['mtime'], 'hash': entry['hash']}
+
+    fingerprint = {'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns, 'hash': get_file_hash(full_path)}
+    if entry and entry['hash'] == fingerprint['hash']:
+        return entry, fingerprint
+
+    return None, fingerprint
+
+def print_rejection_messages(entry):
+    """Repeat the rejected-row messages of a workbook whose rows are reused instead of extracted again."""
+    for message in entry['rejection_messages']:
+        print(message)
+
+# =============================================================================
+# EXTRACTION CACHE
+# =============================================================================
+
+def get_cache_path(file_hash, filename, start_year):
+    """
+    Return the cache file for a workbook's rows. The name starts with the cell mapping hash,
+    so entries from old mappings are never reused.
+    """
+    key = hashlib.sha256(f"{file_hash}|{filename}|{start_year}".encode('utf-8')).hexdigest()
+    return os.path.join(EXTRACT_CACHE_FOLDER, f"{get_extractor_config_hash()[:16]}-{key}.pkl")
+
+def load_cached_rows(cache_path):
+    """Return the cached rows, rejected row counts and rejection messages for a workbook, or None if they aren't cached."""
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except Exception as e:
+        print(f"Could not read {cache_path}: {e}")
+        return None
+
+    os.utime(cache_path)  # Mark as recently used
+    return cached
+
+def save_cached_rows(cache_path, rows, stats):
+    """Save a workbook's rows and rejected rows to the extraction cache."""
+    os.makedirs(EXTRACT_CACHE_FOLDER, exist_ok=True)
+    cached = {'rows': rows, 'rejections': stats['rejections'], 'rejection_messages': stats['rejection_messages']}
+    temp_path = cache_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+
+def prune_extract_cache():
+    """Remove entries from old cell mappings, then the least recently used entries until under the size limit."""
+    if not os.path.isdir(EXTRACT_CACHE_FOLDER):
+        return
+
+    prefix = get_extractor_config_hash()[:16] + '-'
+    entries = []
+    for filename in os.listdir(EXTRACT_CACHE_FOLDER):
+        cache_path = os.path.join(EXTRACT_CACHE_FOLDER, filename)
+        if not filename.startswith(prefix):
+            os.remove(cache_path)
+            continue
+        file_stat = os.stat(cache_path)
+        entries.append((file_stat.st_mtime, file_stat.st_size, cache_path))
+
+    total_size = sum(size for last_used, size, cache_path in entries)
+    for last_used, size, cache_path in sorted(entries):
+        if total_size <= EXTRACT_CACHE_MAX_MB * 1024 * 1024:
+            break
+        os.remove(cache_path)
+        total_size -= size
+
+# =============================================================================
+# PARALLEL EXTRACTION
+# =============================================================================
+
+def extract_source_files(jobs):
+    """
+    Extract the (rows, stats) for each (full_path, filename, start_year, branch_files) job.
+    Results are returned in job order, whether or not the jobs ran in a process pool.
+    """
+    if PARALLEL_EXTRACTION and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return list(executor.map(extract_source_file, *zip(*jobs)))
+
+    return [extract_source_file(*job) for job in jobs]
+
+# =============================================================================
+# PARQUET OUTPUT
+# =============================================================================
+
+def convert_column_values(ws_name, column, values):
+    """Convert one column of dataset values to its fixed Parquet type."""
+    if column in TEXT_COLUMNS:
+        return [None if value is None else str(value) for value in values]
+
+    if column in DATE_COLUMNS:
+        return [datetime.strptime(value, "%Y-%m-%d %H:%M:%S") for value in values]
+
+    if column in DECIMAL_COLUMNS:
+        return [float(value) for value in values]
+
+    numbers = [float(value) for value in values]
+    converted = [int(round(number)) for number in numbers]
+    rounded = sum(1 for number in numbers if not number.is_integer())
+    if rounded:
+        print(f"Parquet output: rounded {rounded} values in {ws_name} {column} that were not whole numbers.")
+    return converted
+
+def write_parquet_dataset(dataset_rows):
+    """Write each worksheet of the master dataset as a typed Parquet file in PARQUET_FOLDER."""
+    if not PARQUET_OUTPUT:
+        return
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Parquet output skipped: pyarrow is not installed (pip install pyarrow).")
+        return
+
+    os.makedirs(PARQUET_FOLDER, exist_ok=True)
+    for ws_name, columns in WORKSHEET_COLUMNS.items():
+        rows = dataset_rows[ws_name]
+        arrays = []
+        fields = []
+        for col_index, column in enumerate(columns):
+            values = convert_column_values(ws_name, column, [row[col_index] for row in rows])
+            if column in TEXT_COLUMNS:
+                arrow_type = pa.string()
+            elif column in DATE_COLUMNS:
+                arrow_type = pa.timestamp('s')
+            elif column in DECIMAL_COLUMNS:
+                arrow_type = pa.float64()
+            else:
+                arrow_type = pa.int64()
+            arrays.append(pa.array(values, type=arrow_type))
+            fields.append(pa.field(column, arrow_type))
+
+        table = pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+        pq.write_table(table, os.path.join(PARQUET_FOLDER, f"{ws_name}.parquet"))
+
+    print(f"Saved Parquet files for {len(WORKSHEET_COLUMNS)} worksheets in {PARQUET_FOLDER}")
+
+# =============================================================================
+# SQLITE STORE
+# =============================================================================
+
+def quote_columns(columns):
+    """Quote column names for use in SQL."""
+    return ', '.join(f'"{column}"' for column in columns)
+
+def open_dataset_store():
+    """
+    Open the SQLite store, creating a table per worksheet with Date/Location indexes. Each table has two extra
+    columns, "Source File" (the workbook that produced the row) and "Row" (its position among that workbook's
+    rows), which together are the primary key. The dataset columns have no declared type, so SQLite keeps
+    every value exactly as extracted (ILL's text Year, a blank Age Group's 0) instead of converting it.
+    The "Sources" table holds the content hash of each workbook whose rows are in the store.
+    """
+    connection = sqlite3.connect(SQLITE_STORE_FILE)
+    connection.execute('CREATE TABLE IF NOT EXISTS "Store Info" ("Config Hash" TEXT)')
+
+    # Rebuild the tables if the cell mappings, columns or table layout changed
+    config_hash = f"{SQLITE_STORE_VERSION}:{get_extractor_config_hash()}"
+    stored_hash = connection.execute('SELECT "Config Hash" FROM "Store Info"').fetchone()
+    if stored_hash is None or stored_hash[0] != config_hash:
+        with connection:
+            for ws_name in WORKSHEET_COLUMNS:
+                connection.execute(f'DROP TABLE IF EXISTS "{ws_name}"')
+            connection.execute('DROP TABLE IF EXISTS "Sources"')
+            connection.execute('DELETE FROM "Store Info"')
+            connection.execute('INSERT INTO "Store Info" VALUES (?)', (config_hash,))
+
+    with connection:
+        connection.execute('CREATE TABLE IF NOT EXISTS "Sources" ("Source File" TEXT PRIMARY KEY, "Hash" TEXT)')
+        for ws_name, columns in WORKSHEET_COLUMNS.items():
+            connection.execute(f'CREATE TABLE IF NOT EXISTS "{ws_name}" ({quote_columns(columns)}, '
+                               f'"Source File" TEXT, "Row" INTEGER, PRIMARY KEY ("Source File", "Row"))')
+            indexed_columns = [column for column in ['Date', 'Location'] if column in columns]
+            for column in indexed_columns:
+                connection.execute(f'CREATE INDEX IF NOT EXISTS "{ws_name} {column}" ON "{ws_name}" ("{column}")')
+
+    return connection
+
+def update_dataset_store(connection, source_rows, source_hashes):
+    """
+    Replace the rows of every source workbook whose content hash differs from the one saved with its rows,
+    so a workbook that changed while the store was off is still picked up. Rows from workbooks that no longer
+    exist are removed.
+    """
+    stored_hashes = dict(connection.execute('SELECT "Source File", "Hash" FROM "Sources"'))
+
+    with connection:
+        for source in set(stored_hashes) - set(source_rows):
+            for ws_name in WORKSHEET_COLUMNS:
+                connection.execute(f'DELETE FROM "{ws_name}" WHERE "Source File" = ?', (source,))
+            connection.execute('DELETE FROM "Sources" WHERE "Source File" = ?', (source,))
+
+        for source, sheet_rows in source_rows.items():
+            if stored_hashes.get(source) == source_hashes[source]:
+                continue
+
+            for ws_name in WORKSHEET_COLUMNS:
+                connection.execute(f'DELETE FROM "{ws_name}" WHERE "Source File" = ?', (source,))
+            for ws_name, rows in sheet_rows.items():
+                columns = WORKSHEET_COLUMNS[ws_name] + ['Source File', 'Row']
+                placeholders = ', '.join('?' * len(columns))
+                connection.executemany(f'INSERT INTO "{ws_name}" ({quote_columns(columns)}) VALUES ({placeholders})',
+                                       [list(row) + [source, row_number] for row_number, row in enumerate(rows)])
+            connection.execute('INSERT OR REPLACE INTO "Sources" VALUES (?, ?)', (source, source_hashes[source]))
+
+def export_dataset_store(connection, sources):
+    """Read every worksheet's rows back out of the SQLite store, workbook by workbook in the given order."""
+    dataset_rows = create_sheet_rows()
+    for ws_name, columns in WORKSHEET_COLUMNS.items():
+        query = f'SELECT {quote_columns(columns)} FROM "{ws_name}" WHERE "Source File" = ? ORDER BY "Row"'
+        for source in sources:
+            dataset_rows[ws_name].extend(list(row) for row in connection.execute(query, (source,)))
+    return dataset_rows
+
+# =============================================================================
+# WATCH MODE
+# =============================================================================
+
+def get_workbook_snapshot(parent_directory):
+    """Return the (size, modified time) of every workbook in the fiscal-year folders."""
+    snapshot = {}
+    for folder_name in find_fiscal_year_folders(parent_directory):
+        folder_path = os.path.join(parent_directory, folder_name)
+        for filename in os.listdir(folder_path):
+            if filename.endswith('.xlsx') and not filename.startswith('~$'):
+                full_path = os.path.join(folder_path, filename)
+                try:
+                    file_stat = os.stat(full_path)
+                except FileNotFoundError:
+                    continue  # Removed while scanning
+                snapshot[full_path] = (file_stat.st_size, file_stat.st_mtime_ns)
+    return snapshot
+
+def is_workbook_open(full_path):
+    """Check for the ~$ lock file Excel keeps next to a workbook while it is open."""
+    folder_path, filename = os.path.split(full_path)
+    lock_files = ['~$' + filename, '~$' + filename[2:]]
+    return any(os.path.exists(os.path.join(folder_path, lock_file)) for lock_file in lock_files)
+
+def watch_fiscal_year_folders(snapshot):
+    """
+    Check the fiscal-year folders every WATCH_INTERVAL_SECONDS and refresh the master dataset once
+    a changed workbook has been quiet for WATCH_DEBOUNCE_SECONDS and is no longer open in Excel.
+    Changes are found by comparing against snapshot, which is taken before the first refresh starts,
+    so a workbook saved while that refresh was running is still picked up.
+    Only the changed workbooks are re-extracted (see INCREMENTAL_REFRESH). Stop with Ctrl+C.
+    """
+    if not INCREMENTAL_REFRESH:
+        print("Watch mode re-reads every workbook on each refresh while INCREMENTAL_REFRESH is off.")
+
+    parent_directory = os.path.dirname(os.getcwd())
+    last_changed = {}  # Workbook path -> when it last changed
+
+    print(f"\nWatching for changes every {WATCH_INTERVAL_SECONDS} seconds. Press Ctrl+C to stop.")
+    try:
+        while True:
+            sleep(WATCH_INTERVAL_SECONDS)
+            new_snapshot = get_workbook_snapshot(parent_directory)
+            now = monotonic()
+            for full_path in set(snapshot) | set(new_snapshot):
+                if snapshot.get(full_path) != new_snapshot.get(full_path):
+                    last_changed[full_path] = now
+            snapshot = new_snapshot
+
+            # Refresh once a changed workbook has been saved for a while and closed
+            ready = [full_path for full_path, changed in last_changed.items()
+                     if now - changed >= WATCH_DEBOUNCE_SECONDS and not is_workbook_open(full_path)]
+            if not ready:
+                continue
+
+            print(f"\nDetected changes in {len(ready)} workbooks, refreshing...")
+            try:
+                refresh_master_dataset()
+            except Exception as e:
+                print(f"Refresh failed, trying again in {WATCH_INTERVAL_SECONDS} seconds: {e}")
+                continue
+            for full_path in ready:
+                del last_changed[full_path]
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
-def main():
-    """Main execution function."""
+def refresh_master_dataset():
+    """Rebuild MasterDataset.xlsx from every fiscal-year folder, reusing rows for unchanged workbooks."""
     print("Starting Master Dataset Creation...")
-    
-    # Remove existing file and create new workbook
-    delete_master_dataset()
-    new_wb, worksheets = create_master_dataset()
+    started = datetime.now()
+    phases = {}       # Seconds spent in each phase of the refresh
+    file_stats = {}   # Timings and rejected rows for each source workbook
+    phase_start = perf_counter()
+
+    # Rows from the last refresh, reused for any workbook that has not changed
+    manifest = load_manifest()
+    new_manifest = {}
 
     # MODIFIED: Get parent directory (go up one level from current script location)
     script_directory = os.getcwd()  # This is now the Dashboard folder
     parent_directory = os.path.dirname(script_directory)  # Go up one level
 
-    folders = [folder for folder in os.listdir(parent_directory) 
-               if (os.path.isdir(os.path.join(parent_directory, folder)) and 
-                   re.match(r"^October 2\d{3} - September 2\d{3}$", folder))]
+    # Sorted so the dataset rows come out in the same order on every run
+    folders = find_fiscal_year_folders(parent_directory)
     
     print(f"Found {len(folders)} fiscal year folders to process.")
     
     # IMPROVED: Collect all unique branches across all fiscal years
     all_branch_legend_data = {}  # Use dict to avoid duplicates
+
+    source_files = []  # Manifest key of every source workbook, in merge order
+    jobs = []          # Workbooks that need to be extracted
+    job_keys = []
     
     for folder_name in folders:
         print(f"\nProcessing folder: {folder_name}")
@@ -483,7 +1210,7 @@ def main():
         start_year = int(folder_name.split(" - ")[0].split()[1])
         
         # Process each file in the folder
-        for filename in os.listdir(folder_path):
+        for filename in sorted(os.listdir(folder_path)):
             
             # Skip temporary Excel files (start with ~$)
             if filename.startswith('~$'):
@@ -492,51 +1219,122 @@ def main():
             
             full_path = os.path.join(folder_path, filename)
             
-            # Process branch files dynamically
-            if filename in branch_files:
-                wb = load_workbook(full_path, data_only=True)
-                process_library_file(wb, worksheets, filename, start_year)
-                print(f"Processed: {filename}")
-                
-            elif filename == 'ILL.xlsx':
-                wb = load_workbook(full_path, data_only=True)
-                sheet = wb.active
-                ill_data = extract_ill_data(sheet, start_year)
-                for ill_row in ill_data:
-                    safe_append_library_row(worksheets['ILL'], ill_row, 
-                                   "System-wide", ill_row[1], ill_row[2], "ILL", skip_columns=3)
-                print(f"Processed: {filename}")
-                
-            elif filename == 'Digital Information.xlsx':
-                wb = load_workbook(full_path, data_only=True)
-                process_digital_info_file(wb, worksheets, start_year)
-                print(f"Processed: {filename}")
-                
-            elif filename == 'Tech Statistics.xlsx':
-                wb = load_workbook(full_path, data_only=True)
-                process_tech_stats_file(wb, worksheets, start_year)
-                print(f"Processed: {filename}")
-                
-            elif filename == 'Summary Usage Report.xlsx':
-                wb = load_workbook(full_path, data_only=True)
-                process_library_usage(wb, worksheets, start_year)
-                print(f"Processed: {filename}")
+            # Process branch files dynamically, along with the system-wide workbooks
+            if filename in branch_files or filename in EXPECTED_FILES:
+                manifest_key = f"{folder_name}/{filename}"
+                entry, fingerprint = find_unchanged_entry(manifest, manifest_key, full_path)
+                new_manifest[manifest_key] = dict(fingerprint, rows=None, rejections={}, rejection_messages=[])
+                source_files.append(manifest_key)
+
+                if entry is not None:
+                    print(f"Unchanged: {filename}")
+                    print_rejection_messages(entry)
+                    new_manifest[manifest_key].update(rows=entry['rows'], rejections=entry['rejections'],
+                                                      rejection_messages=entry['rejection_messages'])
+                    file_stats[manifest_key] = {'status': 'unchanged', 'rejections': entry['rejections']}
+                else:
+                    jobs.append((full_path, filename, start_year, branch_files))
+                    job_keys.append(manifest_key)
                 
             else:
                 if filename.endswith('.xlsx'):
                     print(f"Ignored: {filename}")
+
+    phases['Scan folders'] = perf_counter() - phase_start
+
+    # Changed workbooks whose contents were extracted before are read from the extraction cache
+    cache_paths = {}
+    if EXTRACT_CACHE:
+        phase_start = perf_counter()
+        uncached_jobs = []
+        for manifest_key, job in zip(job_keys, jobs):
+            full_path, filename, start_year, branch_files = job
+            file_hash = new_manifest[manifest_key].get('hash') or get_file_hash(full_path)
+            cache_paths[manifest_key] = get_cache_path(file_hash, filename, start_year)
+            cached = load_cached_rows(cache_paths[manifest_key])
+            if cached is None:
+                uncached_jobs.append((manifest_key, job))
+            else:
+                new_manifest[manifest_key].update(cached)
+                file_stats[manifest_key] = {'status': 'cached', 'rejections': cached['rejections']}
+                print(f"Cached: {manifest_key}")
+                print_rejection_messages(cached)
+        job_keys = [manifest_key for manifest_key, job in uncached_jobs]
+        jobs = [job for manifest_key, job in uncached_jobs]
+        phases['Extraction cache'] = perf_counter() - phase_start
+
+    # Extract every remaining workbook, then merge all rows in folder and file order
+    phase_start = perf_counter()
+    if jobs:
+        print(f"\nExtracting {len(jobs)} workbooks...")
+    for manifest_key, (rows, stats) in zip(job_keys, extract_source_files(jobs)):
+        new_manifest[manifest_key].update(rows=rows, rejections=stats['rejections'],
+                                          rejection_messages=stats['rejection_messages'])
+        file_stats[manifest_key] = dict(stats, status='processed')
+        if EXTRACT_CACHE:
+            save_cached_rows(cache_paths[manifest_key], rows, stats)
+        print(f"Processed: {manifest_key}")
+    if EXTRACT_CACHE:
+        prune_extract_cache()
+    phases['Extract workbooks'] = perf_counter() - phase_start
+
+    phase_start = perf_counter()
+    dataset_rows = create_sheet_rows()
+    for manifest_key in source_files:
+        for ws_name, rows in new_manifest[manifest_key]['rows'].items():
+            dataset_rows[ws_name].extend(rows)
     
     # IMPROVED: Convert dict back to list format for populate_legend_worksheets
     final_branch_legend_data = [[branch_name, location_name] 
                                for branch_name, location_name in all_branch_legend_data.items()]
 
     # Populate legend worksheets
-    populate_legend_worksheets(worksheets, final_branch_legend_data)
+    populate_legend_worksheets(dataset_rows, final_branch_legend_data)
+    phases['Merge rows'] = perf_counter() - phase_start
+
+    # Keep the SQLite store up to date and export the dataset from it
+    if SQLITE_STORE:
+        phase_start = perf_counter()
+        source_rows = {manifest_key: new_manifest[manifest_key]['rows'] for manifest_key in source_files}
+        source_rows['Branch Legend'] = {'Branch Legend': dataset_rows['Branch Legend']}
+        source_hashes = {manifest_key: new_manifest[manifest_key].get('hash') or
+                         get_file_hash(os.path.join(parent_directory, manifest_key)) for manifest_key in source_files}
+        source_hashes['Branch Legend'] = hashlib.sha256(pickle.dumps(dataset_rows['Branch Legend'])).hexdigest()
+        connection = open_dataset_store()
+        update_dataset_store(connection, source_rows, source_hashes)
+        dataset_rows = export_dataset_store(connection, ['Branch Legend'] + source_files)
+        connection.close()
+        phases['SQLite store'] = perf_counter() - phase_start
     
     # Save the final dataset
-    new_wb.save('MasterDataset.xlsx')
+    phase_start = perf_counter()
+    worksheets = save_master_dataset(dataset_rows)
+    phases['Save MasterDataset.xlsx'] = perf_counter() - phase_start
+
+    phase_start = perf_counter()
+    save_manifest(new_manifest)
+    phases['Save manifest'] = perf_counter() - phase_start
+
+    if PARQUET_OUTPUT:
+        phase_start = perf_counter()
+        write_parquet_dataset(dataset_rows)
+        phases['Parquet output'] = perf_counter() - phase_start
+
+    write_refresh_report(build_refresh_report(started, phases, file_stats, dataset_rows))
     print(f"\nCompleted! Master Dataset created with {len(worksheets)} worksheets.")
-    input("Press Enter to exit...")
+
+def main():
+    """Main execution function."""
+    # Snapshot the workbooks before refreshing, so watch mode sees anything saved during the refresh
+    if WATCH_MODE:
+        snapshot = get_workbook_snapshot(os.path.dirname(os.getcwd()))
+
+    refresh_master_dataset()
+
+    if WATCH_MODE:
+        watch_fiscal_year_folders(snapshot)
+    else:
+        input("Press Enter to exit...")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,241 +1,397 @@
-import csv, os, re
-from time import time
+import csv, io, os, re
+from sys import intern
+import hashlib, json, pickle
+from time import perf_counter, time
+from datetime import datetime
 # Import Helper Functions From Python Libraries
 from openpyxl import load_workbook, Workbook
 from openpyxl.utils import get_column_letter
+from collections import Counter, deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import compress, islice, repeat
+from operator import contains, itemgetter
+
+# =============================================================================
+# CONFIGURATION SECTION - Easy to modify mappings and settings
+# =============================================================================
+
+# Program classification rules are read from PROGRAM_RULES_FILE, so keywords can be edited without changing
+# this script. Rules are checked in file order for every event title (case-insensitive): an event belongs to a
+# program when its title contains one of the title keywords and none of the title exceptions, or when one of its
+# categories is exactly one of the category keywords. Events that match no program are listed as "Unmatched Events".
+# The compiled matcher is cached in PROGRAM_RULES_CACHE and only rebuilt when the rule file's contents change.
+PROGRAM_RULES_FILE = 'Program Rules.json'
+PROGRAM_RULES_CACHE = 'Program Rules Cache.pkl'
+PROGRAM_RULES_CACHE_VERSION = 1
+
+# Classification memo: recurring events (weekly story times, monthly clubs) share titles and categories,
+# so each distinct (title, categories) pair is classified once. CLASSIFICATION_MEMO_SIZE bounds the
+# in-memory memo. With CLASSIFICATION_MEMO_CACHE the memo is also saved to CLASSIFICATION_MEMO_FILE for the
+# next refresh, and discarded whenever the program rules change.
+CLASSIFICATION_MEMO_SIZE = 50000
+CLASSIFICATION_MEMO_CACHE = False
+CLASSIFICATION_MEMO_FILE = 'Classification Cache.pkl'
+
+# Classifier profiling: record how many events each program rule and keyword was checked against and how many it
+# matched, and the time the classifier took on each batch of events, and save a ranked report to
+# CLASSIFIER_PROFILE_FILE along with the titles left as "Unmatched Events". Counting keyword matches takes an extra
+# pass over the titles, so a profiled refresh runs slower. Parsing stays in this process (no parallel or sharded
+# ingestion) and the export cache is skipped, so every event is counted.
+CLASSIFIER_PROFILE = False
+CLASSIFIER_PROFILE_FILE = 'Classifier Profile.xlsx'
+
+# Number of CSV rows parsed together and added to the dataset worksheets as one batch
+CSV_CHUNK_SIZE = 5000
+
+# Vectorized times: compute Duration and Staff Time for each batch with NumPy arrays instead of
+# event by event. Falls back to the plain calculation if NumPy is missing (requires: pip install numpy)
+VECTORIZED_TIMES = True
+
+# Every lc_events_*.csv export in the folder is read, newest (last modified) first. An event that appears in
+# several exports is taken from the newest one, so exports can be split by year and only the latest re-exported.
+# Parallel ingestion reads the exports in separate processes (one per CPU core unless MAX_WORKERS is set).
+PARALLEL_INGESTION = False
+MAX_WORKERS = None
+
+# Export cache: keep the worksheet rows parsed from each export in EXPORT_CACHE_FOLDER, keyed by the export's contents
+# and the program rules. Exports that haven't changed since the last refresh (older years) are loaded from the cache
+# instead of being read and classified again, so a refresh costs about as much as its new or re-exported files.
+# An export with the same size and modified time as last time isn't even re-hashed.
+EXPORT_CACHE = True
+EXPORT_CACHE_FOLDER = 'Matrix Map Export Cache'
+EXPORT_CACHE_VERSION = 1
+
+# Sharded ingestion splits each export into byte ranges of about SHARD_SIZE bytes and parses and classifies every
+# range in its own process, so even a single very large export uses every CPU core. Ranges always end between CSV
+# records, never inside a quoted multi-line Description.
+SHARDED_INGESTION = False
+SHARD_SIZE = 16 * 1024 * 1024
+
+# Dimension tables: list each audience, category, internal tag, branch and location once in its own worksheet under
+# a whole-number key. EventInformation and the EventAudiences, EventCategories and EventInternalTags bridge tables then
+# hold keys instead of repeating the text. This shrinks the dataset and the Power BI model, but changes the worksheet
+# layout, so the Matrix Map report's relationships have to be updated to match before turning it on. Keys are kept
+# in DIMENSION_KEYS_FILE so every value keeps its key from one refresh to the next, and new values get the next free key.
+DIMENSION_TABLES = False
+DIMENSION_KEYS_FILE = 'Matrix Map Dimension Keys.json'
+DIMENSION_KEYS_VERSION = 1
+
+# Partitioned output: instead of one 'Matrix Map Dataset.xlsx', save one dataset workbook per fiscal year in
+# PARTITION_FOLDER, listed in PARTITION_MANIFEST_FILE. A fiscal year's workbook is only rewritten when its rows
+# changed, so a refresh usually rewrites just the current year, and Power BI can load only the years it needs.
+PARTITIONED_OUTPUT = False
+PARTITION_FOLDER = 'Matrix Map Dataset by Fiscal Year'
+PARTITION_MANIFEST_FILE = 'Partition Manifest.json'
+PARTITION_MANIFEST_VERSION = 1
+
+# Also create 'Simple Map.xlsx' (Program Statistics and Program Options) from totals kept while the CSV is read
+CREATE_SIMPLE_MAP = False
+
+# =============================================================================
+# PROGRAM CLASSIFICATION
+# =============================================================================
+
+class ProgramMatcher:
+    """
+    The program rules compiled once into an Aho-Corasick automaton over every lowercased title keyword and
+    exception, plus a lookup of category keywords. A title is scanned once, character by character, and
+    every rule it hits is reported, so the cost grows with the title length rather than the keyword count.
+    Rule hits are kept as bitmasks (bit i = rule i).
+    """
+
+    def __init__(self, rules):
+        self.programs = [rule["program"] for rule in rules]
+        self.goto = [{}]
+        self.fail = [0]
+        self.title_masks = [0]
+        self.exception_masks = [0]
+        self.category_masks = {}
+
+        for index, rule in enumerate(rules):
+            bit = 1 << index
+            for keyword in rule.get("title_keywords", []):
+                self.title_masks[self.add_keyword(keyword.lower())] |= bit
+            for keyword in rule.get("title_exceptions", []):
+                self.exception_masks[self.add_keyword(keyword.lower())] |= bit
+            for keyword in rule.get("category_keywords", []):
+                keyword = keyword.lower()
+                self.category_masks[keyword] = self.category_masks.get(keyword, 0) | bit
+
+        self.build_failure_links()
+
+    def add_keyword(self, keyword):
+        """Add a keyword to the trie and return the state where it ends."""
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.title_masks.append(0)
+                self.exception_masks.append(0)
+            state = next_state
+        return state
+
+    def build_failure_links(self):
+        """Link each state to its longest proper suffix in the trie and inherit that suffix's matches."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.title_masks[next_state] |= self.title_masks[self.fail[next_state]]
+                self.exception_masks[next_state] |= self.exception_masks[self.fail[next_state]]
+                queue.append(next_state)
+
+    def scan_title(self, title):
+        """Return the (title keyword, title exception) rule masks hit by a lowercased title."""
+        goto, fail = self.goto, self.fail
+        title_masks, exception_masks = self.title_masks, self.exception_masks
+        state = title_mask = exception_mask = 0
+        for char in title:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            title_mask |= title_masks[state]
+            exception_mask |= exception_masks[state]
+        return title_mask, exception_mask
+
+    def match(self, title, categories):
+        """Return the programs matched by a lowercased title and its lowercased categories, in rule order."""
+        title_mask, exception_mask = self.scan_title(title)
+        matched = title_mask & ~exception_mask
+        for category in categories:
+            matched |= self.category_masks.get(category, 0)
+        return [program for index, program in enumerate(self.programs) if matched >> index & 1]
+
+    def get_state(self):
+        """Return the compiled automaton as plain lists and dicts, for the rule cache."""
+        return (self.programs, self.goto, self.fail, self.title_masks, self.exception_masks, self.category_masks)
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a ProgramMatcher from get_state() without recompiling the rules."""
+        matcher = cls.__new__(cls)
+        (matcher.programs, matcher.goto, matcher.fail, matcher.title_masks,
+         matcher.exception_masks, matcher.category_masks) = state
+        return matcher
+
+def load_program_rules():
+    """Read PROGRAM_RULES_FILE and return the rules and the file's hash."""
+    if not os.path.exists(PROGRAM_RULES_FILE):
+        print(f"No '{PROGRAM_RULES_FILE}' found in the current directory.")
+        print("Could not update Matrix Map Dataset.")
+        exit(1)
+
+    with open(PROGRAM_RULES_FILE, 'rb') as f:
+        contents = f.read()
+
+    try:
+        rules = json.loads(contents.decode('utf-8'))
+        for rule in rules:
+            if not rule.get("program"):
+                raise ValueError(f"rule without a program name: {rule}")
+    except (ValueError, AttributeError, TypeError) as e:
+        print(f"Could not read the program rules in '{PROGRAM_RULES_FILE}': {e}")
+        print("Could not update Matrix Map Dataset.")
+        exit(1)
+
+    return rules, hashlib.sha256(contents).hexdigest()
+
+def load_cached_matcher(rules_hash):
+    """Load the compiled matcher from PROGRAM_RULES_CACHE, or None if it was built from different rules."""
+    if not os.path.exists(PROGRAM_RULES_CACHE):
+        return None
+
+    try:
+        with open(PROGRAM_RULES_CACHE, 'rb') as f:
+            cache = pickle.load(f)
+    except Exception as e:
+        print(f"Could not read {PROGRAM_RULES_CACHE}, the program rules will be recompiled: {e}")
+        return None
+
+    if cache.get('version') != PROGRAM_RULES_CACHE_VERSION or cache.get('rules_hash') != rules_hash:
+        return None
+    return ProgramMatcher.from_state(cache['matcher'])
+
+def save_cached_matcher(matcher, rules_hash):
+    """Save the compiled matcher so the next run can skip compiling unchanged rules."""
+    cache = {'version': PROGRAM_RULES_CACHE_VERSION, 'rules_hash': rules_hash, 'matcher': matcher.get_state()}
+    with open(PROGRAM_RULES_CACHE, 'wb') as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+@lru_cache(maxsize=None)
+def compile_program_rules():
+    """Return the ProgramMatcher for PROGRAM_RULES_FILE, from the cache when the rules haven't changed (once per run)."""
+    rules, rules_hash = load_program_rules()
+    matcher = load_cached_matcher(rules_hash)
+    if matcher is None:
+        matcher = ProgramMatcher(rules)
+        save_cached_matcher(matcher, rules_hash)
+        print(f"Compiled {len(rules)} program rules from '{PROGRAM_RULES_FILE}'.")
+    matcher.rules_hash = rules_hash
+    return matcher
+
+# Programs matched by each (lowercased title, sorted lowercased categories), least recently used first
+classification_memo = OrderedDict()
+
+def load_classification_memo():
+    """Load the classifications saved by the last refresh, if they were made with the current program rules."""
+    if not CLASSIFICATION_MEMO_CACHE or not os.path.exists(CLASSIFICATION_MEMO_FILE):
+        return
+
+    try:
+        with open(CLASSIFICATION_MEMO_FILE, 'rb') as f:
+            cache = pickle.load(f)
+    except Exception as e:
+        print(f"Could not read {CLASSIFICATION_MEMO_FILE}, every event will be classified: {e}")
+        return
+
+    if cache.get('rules_hash') != compile_program_rules().rules_hash:
+        print("Program rules changed since the last refresh, every event will be classified.")
+        return
+
+    classification_memo.update(cache['results'])
 
-def classify_event_program_by_title(wb, EventID, Title, Categories):
-    match_found = False
-    ws = wb["EventProgram"]
+def save_classification_memo():
+    """Save the classifications for the next refresh."""
+    if not CLASSIFICATION_MEMO_CACHE:
+        return
+
+    cache = {'rules_hash': compile_program_rules().rules_hash, 'results': classification_memo}
+    with open(CLASSIFICATION_MEMO_FILE, 'wb') as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def get_event_programs(Title, Categories):
+    """Return the programs for a lowercased title and lowercased categories, classifying each distinct pair once."""
+    key = (Title, tuple(sorted(set(Categories))))
+    programs = classification_memo.get(key)
+    if programs is not None:
+        classification_memo.move_to_end(key)
+        return programs
+
+    programs = tuple(compile_program_rules().match(Title, Categories))
+    classification_memo[key] = programs
+    if len(classification_memo) > CLASSIFICATION_MEMO_SIZE:
+        classification_memo.popitem(last=False)
+    return programs
+
+def get_program_names(Title, Categories):
+    """Return the programs for one event's title and categories, or ("Unmatched Events",) if none match."""
     Title = Title.lower()  # Case-insensitive match
     if "cancelled" in Title or "canceled" in Title:
-        return
+        return ()
 
     Categories = [cat.lower() for cat in Categories]
 
-    # ---------- STORY TIME Programs ----------
-    # Define keyword patterns
-    title_keywords = ["time", "40 carrots", "Puppet", "Dr. Seuss Day", "Soar"]
-    category_keywords = ["literacy > storytimes"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Story Time"])
-        match_found = True
-
-
-    # ---------- MAKERSPACE + CRAFTS Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Hogwarts", "Sleeping Mat", "Scrapbook", "Sensory Sensitive", "Spring Festival",
-        "Stitch", "Ginger", "Outdoors", "Potion", "Sand Dollar",
-        "Yarn", "Lanterns", "Mirrors", "Pencil", "Wreaths",
-        "Oyster", "Knit", "Ornaments", "Card-making", "3D Print",
-        "Art Lab", "Coloring Club", "Drop", "Model Magic", "Art Media",
-        "Art Station", "Tea with an Artist", "Sew", "Valentines", "Art House",
-        "Art with Leaves", "Mood Board", "t-shirts", "Bad Art", "Making Cards",
-        "Bookmarks", "Bedazzle", "Quilt", "TinkerCAD", "Wind Chimes",
-        "Book Folding", "Bookmark Challenge", "Bottle Cap", "Writers Group", "Builders Club",
-        "Calligraphy", "Canvas", "Cardmaking", "Chalk Art", "Collage",
-        "Painting", "Craft", "Hydrangeas", "Create", "Creative",
-        "Design", "Crochet", "Decorate", "Paper", "DIY",
-        "Art Studio", "Drawing", "Dream Catchers", "Teacups", "Photo",
-        "Makerspace", "Resin", "FOL", "Jar", "Gift Wrap",
-        "Champagne Flutes", "Glowforge", "Gnome", "Terrarium", "Harry Potter",
-        "Art Corner", "Workshop", "Star Wars", "Superhero", "Polymer",
-        "Colors", "Art Club", "Origami", "Cricut", "Seashell",
-        "Seaside Quilters", "Write Away!", "Jelly Bean", "Poet", "Magic Crystals",
-        "Bandana", "Headband!", "Patchworkers", "Memoir", "Memory Makers",
-        "Bottle Decoding", "Bracelet", "New Art Mediums", "Journaling", "Writing"
-    ]
-    title_exceptions = ["plant", "weight", "conservation"]
-    category_keywords = ["makerspace", "crafts", "Drawing", "Virtual Reality"]
-    # Search for keywords
-    if (any(keyword.lower() in Title for keyword in title_keywords) and not any(keyword.lower() in Title for keyword in title_exceptions)) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Makerspace and Workshop"])
-        match_found = True
-    
-    # ---------- ONE ON ONE TECH SUPPORT Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Apple Products", "Digitizing", "Virtual Reality", "Excel", "iPhone",
-        "Tech", "App", "iPad", "Microsoft", "Library 101", "Computers", 
-        "Archive Lab", "Podcasting", "Libby", "Scratch"
-    ]
-    category_keywords = ["Technology", "Technology > Computers", "Technology > iPhone/iPad", 
-                         "Technology > One-on-One Help", "Technology > STEM"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Tech Support"])
-        match_found = True
-
-
-    # ---------- BOOK CLUBS Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Discussion", "Book Circle", "Book Club", "Keep your secrets", "Literary Travel",
-        "Improv", "Mystery", "Graphic Novels", "Author Fair"
-    ]
-    category_keywords = ["Literacy > Book Clubs & Author Talks"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Book Club"])
-        match_found = True
-
-    # ---------- READER'S ADVISORY Programs ----------
-    category_keywords = ["Reader's Advisory"]
-    # Search for keywords
-    if any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Reader's Advisory"])
-        match_found = True
-    
+    programs = get_event_programs(Title, Categories)
+    if not programs:
+        programs = ("Unmatched Events",)
+    return programs
+
+# Classifier profile: {(program, keyword type, keyword): [evaluations, matches]}, {program: [evaluations, matches]},
+# the number of events for each unmatched title, and the seconds the classifier took over how many batches
+keyword_profile = {}
+program_profile = {}
+unmatched_titles = Counter()
+classifier_timing = {'seconds': 0.0, 'batches': 0}
+
+@lru_cache(maxsize=None)
+def get_profiled_rules():
+    """Return each program with its lowercased (keyword type, keyword) checks, in rule order."""
+    rules, _ = load_program_rules()
+    return [(rule["program"],
+             [("Title Keyword", keyword.lower()) for keyword in rule.get("title_keywords", [])] +
+             [("Title Exception", keyword.lower()) for keyword in rule.get("title_exceptions", [])] +
+             [("Category Keyword", keyword.lower()) for keyword in rule.get("category_keywords", [])])
+            for rule in rules]
+
+def profile_classification(events, Programs, seconds):
+    """
+    Add a batch of events to the classifier profile. Programs is what the classifier returned for each event and
+    seconds the time it took on the whole batch. The matcher scans each title once for every rule together, so its
+    time can't be split by keyword; each keyword's checks and matches are counted separately, over the batch's
+    distinct titles and category lists weighted by the number of events sharing them.
+    """
+    classifier_timing['seconds'] += seconds
+    classifier_timing['batches'] += 1
 
-    # ---------- Discovery Center Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Moogician", "Stev", "Polly", "Mangrove", "Razzmatazz",
-        "Lawn for Tweens", "Roar", "Jungle Gardens", "Campbell", "Adventure Club",
-        "Kids Club", "After School Chill", "Anime Club", "Privateers", "Read-Aloud",
-        "Parrot Show", "Block Fest", "Reads-A-Lot", "Cephalopalooza", "Colorful",
-        "Curiosity Club", "Didgeridoo", "Dog", "obstacle course", "Smokey",
-        "Summer Learning", "Traveler's", "Mad Science", "Out of My Hands", "School of Rock",
-        "Showtime", "STEAM", "Mart", "JiggleMan!", "Balloon Show",
-        "Make Believe"
-    ]
-    category_keywords = ["Summer Learning"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Discovery Center"])
-        match_found = True
-
-
-    # ---------- GENEALOGY SERVICES Programs ----------
-    # Define keyword patterns
-    title_keywords = ["Heritage","Genealogists","Genealogical","Genealogy","Family History","DNA"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords):
-        ws.append([EventID, "Genealogy Services"])
-        match_found = True
-
-
-    # ---------- LANGUAGE AND CULTURE Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Sign Language", "ESL", "ESOL", "French", "Spanish Class", "Mandarin",
-        "Conversations","Culture","Friends 2025 Lecture & Travel","Morocc","Atlas"
-    ]
-    category_keywords = ["Language Learning", "International", "Travel & Leisure", "Voyagers"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Language and Culture"])
-        match_found = True
-
-
-    # ---------- LOCAL HISTORY AND ARCHIVES Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Pirates of the Florida Coast", "American Revolution", "Ghosts", "Palma Sola", "Ship Passenger Records",
-        "Presidency", "Hamilton", "History", "Military Challenge Coins", "Veteran",
-        "War", "Leading Ladies", "Steel Ring Academy", "Memorial", "Flags",
-        "Museum", "Frank Lloyd Wright", "Florida Authors", "Ringling", "Spooky"
-    ]
-    category_keywords = ["FLORIDA"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Local History & Archives"])
-        match_found = True
-
-
-    # ---------- FITNESS AND WELLNESS Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Reset and Renew", "Peer Support", "Weight", "Nourish", "Healing",
-        "Stroller Strides", "Swag", "After School Chill", "Aerobics", "Wellness",
-        "Pilates", "Alzheimer", "Cooking", "Dancing", "Cancer",
-        "Yoga", "Zumba", "Winemaking", "Blood", "Safety",
-        "Feast", "Prevention", "Health Resource", "Foods That Heal", "Screening",
-        "HIV", "Mental Health", "Balance", "Healthiest Self", "Hike",
-        "Zen Zone", "Tai Chi", "Sound Bath", "Public Health", "Nutrition",
-        "Illness", "Meditation", "Herbal", "Cuisine", "Jazzercise",
-        "Health Department", "Medicare", "Senior Health", "Senior Living", "SHINE",
-        "Dance Along", "Memory Cafe", "Mindful", "Dance-A-Long"
-    ]
-    category_keywords = ["Health/Fitness/Wellness", "Sports & Leisure"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Fitness and Wellness"])
-        match_found = True
-
-    # ---------- ENTERTAINMENT Programs ----------
-    title_keywords = [
-        "Pinochle", "Morning Card-toons", "Wonder Lab", "Wonderland", "Dance Mob",
-        "SOM", "Chocolate Factory", "Stuffed Animal", "Sweet", "Taskmaster",
-        "Y2K", "Thanksgiving", "Beauty and the Beast", "Anniversary", "Open Mic",
-        "Parrish Playworks", "Peter Rabbit", "Pigeon Party", "Polo Club", "St. Patrick",
-        "OZ", "Novemberfest", "Candy Land", "Bingo", "Board Game Bash",
-        "Boggle", "Bricks4Kidz", "Bridge", "Bubble Party", "Chess",
-        "Juguemos", "Dungeons", "Duplo", "Egg Hunt", "End of Summer",
-        "DND", "The Office", "Fall Frienzy", "Fright", "Movie",
-        "Fantasy Map", "Foam", "Fort Night", "Game", "Galentine's Night",
-        "Holiday Party", "Geocaching", "Garden Party", "Parade", "Santa",
-        "Kickoff", "Kick-Off", "Smash", "RPG", "Pokemon",
-        "Pokémon", "Peeps", "Pizza", "Nintendo", "Minecraft",
-        "Mario", "jong", "Lego", "Just Dance", "Holidays Around the World",
-        "Playground", "Playgroup", "Golf", "Oreo", "Hunt",
-        "Gaming", "Waffle party", "Playdough", "Trivia", "Candyland",
-        "Trick or Treat", "Truck", "Polar Express", "Lil' Manatee Cove", "Lo-Fi"
-    ]
-    category_keywords = ["Fun & Games", "Arts & Entertainment", "Concert"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Entertainment"])
-        match_found = True
-    
-    # ---------- NATURE AND HOME Programs ----------
-    # Define keyword patterns
-    title_keywords = [
-        "Marine Lab", "Family Treasures", "Yard Drinking", "Water Conservation", "Recycling",
-        "Turtle Watch", "Gardener", "Irrigation", "Build Homes", "Garden",
-        "Dipnetting", "Decluttering", "Home Decor", "Landscapes", "Recycle",
-        "Agriculture", "Natural Resources", "Seed", "Wildlife", "Plant",
-    ]
-    title_exceptions = ["Teacups"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) and not any(keyword.lower() in Title for keyword in title_exceptions):
-        ws.append([EventID, "Nature and Home"])
-        match_found = True
-
-    # ---------- MUSIC AND FILM Programs ----------
-    # Define keyword patterns
-    title_keywords = ["Ukulele","Broadway","Concert","Blues","Cinema","Guitar","Opera","Instrument","Music"]
-    category_keywords = ["Music Instruction"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords) or any(keyword.lower() in Categories for keyword in category_keywords):
-        ws.append([EventID, "Music and Film"])
-        match_found = True
-
-    # --------- IMPORTANT MEETINGS ---------
-    # Define keyword patterns
-    title_keywords = ["Board Meeting","Teen Advisory Board","Town Hall","Literacy Council"]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords):
-        ws.append([EventID, "Important Meeting"])
-        match_found = True
-
-    # --------- LIFE SKILLS AND COMMUNITY RESOURCES MEETINGS ---------
-    # Define keyword patterns
-    title_keywords =  [
-        "Welcome to Our World", "Families Educational Seminar", "Tax", "Career", "Financial",
-        "Finanzas", "Job Fair", "Scams", "FAFSA", "Antiques", "Food Bank", "Vote", "Sale", 
-        "Community", "Alliance Gives Back"
-    ]
-    # Search for keywords
-    if any(keyword.lower() in Title for keyword in title_keywords):
-        ws.append([EventID, "Life Skills and Community Resource"])
-        match_found = True
-    
-    # ---------- UNMATCHED PROGRAMS ----------
-    if not match_found:
-        ws.append([EventID, "Unmatched Events"])
+    events = [(row, programs) for row, programs in zip(events, Programs) if programs]  # Not cancelled
+    if not events:
+        return
+
+    Titles = Counter(row[1].lower() for row, _ in events)
+    CategoryLists = Counter(tuple(category.strip().lower() for category in row[14].split(",")) for row, _ in events)
+    Programs = Counter(programs for _, programs in events)
+
+    checked = {"Title": (list(Titles), list(Titles.values())),
+               "Category": (list(CategoryLists), list(CategoryLists.values()))}
+    for program, keywords in get_profiled_rules():
+        for keyword_type, keyword in keywords:
+            values, weights = checked["Category" if keyword_type == "Category Keyword" else "Title"]
+            stats = keyword_profile.setdefault((program, keyword_type, keyword), [0, 0])
+            stats[0] += len(events)
+            stats[1] += sum(compress(weights, map(contains, values, repeat(keyword))))
+
+        stats = program_profile.setdefault(program, [0, 0])
+        stats[0] += len(events)
+        stats[1] += sum(count for programs, count in Programs.items() if program in programs)
+
+    unmatched_titles.update(row[1].lower() for row, programs in events if programs == ("Unmatched Events",))
+
+def save_classifier_profile():
+    """Print the classifier's time and the most-matched keywords, and save the full profile to CLASSIFIER_PROFILE_FILE."""
+    if not CLASSIFIER_PROFILE:
+        return
+
+    # Every rule is checked for every event, so any rule's evaluation count is the number of events classified
+    unmatched_count = sum(unmatched_titles.values())
+    event_count = next(iter(program_profile.values()))[0] if program_profile else unmatched_count
+    seconds = classifier_timing['seconds']
+
+    ranked_keywords = sorted(keyword_profile.items(), key=lambda item: item[1][1], reverse=True)
+    ranked_programs = sorted(program_profile.items(), key=lambda item: item[1][1], reverse=True)
+
+    print(f"Classifier profile: {event_count} event(s) classified in {seconds * 1000:.2f} ms "
+          f"({seconds * 1e6 / event_count if event_count else 0:.2f} µs per event), "
+          f"{unmatched_count} left as Unmatched Events.")
+    print("Most matched keywords:")
+    for (program, keyword_type, keyword), (evaluations, matches) in ranked_keywords[:10]:
+        print(f"  {matches:>7} match(es)  {matches / evaluations if evaluations else 0:6.1%}  "
+              f"{program}: {keyword_type.lower()} '{keyword}'")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Summary")
+    ws.append(["Events Classified", "Unmatched Events", "Batches", "Classifier Time (ms)", "Time per Event (µs)"])
+    ws.append([event_count, unmatched_count, classifier_timing['batches'], seconds * 1000,
+               seconds * 1e6 / event_count if event_count else 0])
+
+    ws = wb.create_sheet(title="Keywords")
+    ws.append(["Rank", "Program", "Keyword Type", "Keyword", "Evaluations", "Matches", "Match Rate"])
+    for rank, ((program, keyword_type, keyword), (evaluations, matches)) in enumerate(ranked_keywords, 1):
+        ws.append([rank, program, keyword_type, keyword, evaluations, matches,
+                   matches / evaluations if evaluations else 0])
+
+    ws = wb.create_sheet(title="Programs")
+    ws.append(["Rank", "Program", "Evaluations", "Matches", "Match Rate"])
+    for rank, (program, (evaluations, matches)) in enumerate(ranked_programs, 1):
+        ws.append([rank, program, evaluations, matches, matches / evaluations if evaluations else 0])
+    ws.append([None, "Unmatched Events", event_count, unmatched_count,
+               unmatched_count / event_count if event_count else 0])
+
+    ws = wb.create_sheet(title="Unmatched Titles")
+    ws.append(["Rank", "Title", "Events"])
+    for rank, (title, count) in enumerate(unmatched_titles.most_common(), 1):
+        ws.append([rank, title, count])
+
+    wb.save(CLASSIFIER_PROFILE_FILE)
+    print(f"Saved classifier profile as '{CLASSIFIER_PROFILE_FILE}'.")
 
 def convert_time_to_hours(time_str):
     """Convert a time string in 'HH:MM' format to hours as a float."""
@@ -291,9 +447,111 @@ def calculate_event_staff_time(start_time, end_time, set_up_time, tear_down_time
     total_staff_time = event_duration + set_up_duration + tear_down_duration
     return total_staff_time
 
+@lru_cache(maxsize=None)
+def load_numpy():
+    """Import NumPy for VECTORIZED_TIMES, or return None (once per run) if it isn't installed."""
+    try:
+        import numpy
+    except ImportError:
+        print("Vectorized times skipped: numpy is not installed (pip install numpy).")
+        return None
+    return numpy
+
+def compute_event_times(StartTimes, EndTimes, SetUpTimes, TearDownTimes):
+    """Return the Duration, Staff Time and Formatted Duration columns for a batch of event time columns."""
+    np = load_numpy() if VECTORIZED_TIMES else None
+    if np is not None and StartTimes:
+        return compute_event_times_vectorized(np, StartTimes, EndTimes, SetUpTimes, TearDownTimes)
+
+    Durations = [calculate_duration(start, end) for start, end in zip(StartTimes, EndTimes)]
+    StaffTimes = [calculate_event_staff_time(start, end, set_up, tear_down)
+                  for start, end, set_up, tear_down in zip(StartTimes, EndTimes, SetUpTimes, TearDownTimes)]
+    FormattedDurations = [format_hours(duration) for duration in Durations]
+    return Durations, StaffTimes, FormattedDurations
+
+def compute_event_times_vectorized(np, StartTimes, EndTimes, SetUpTimes, TearDownTimes):
+    """
+    compute_event_times on NumPy arrays, giving exactly the same values (and -1 / 0 markers) as the plain functions.
+    Each distinct time string is parsed once by convert_time_to_hours, then all arithmetic runs on whole columns.
+    """
+    count = len(StartTimes)
+    time_strings, positions = np.unique(np.array(StartTimes + EndTimes + SetUpTimes + TearDownTimes),
+                                        return_inverse=True)
+    hours = np.array([convert_time_to_hours(str(time_str)) for time_str in time_strings], dtype=float)
+    start, end, set_up, tear_down = hours[positions].reshape(4, count)
+
+    def duration(first, second):
+        # Same as calculate_duration: -1 when either time is missing or invalid
+        return np.where((first == -1) | (second == -1), -1.0, second - first)
+
+    event_duration = duration(start, end)
+    set_up_duration = duration(set_up, start)
+    tear_down_duration = duration(end, tear_down)
+
+    # Same as calculate_event_staff_time: any -1 duration counts as 0
+    staff_time = (np.where(event_duration == -1, 0.0, event_duration)
+                  + np.where(set_up_duration == -1, 0.0, set_up_duration)
+                  + np.where(tear_down_duration == -1, 0.0, tear_down_duration))
+
+    # Back to Python numbers, keeping the plain functions' whole-number -1 and 0 markers
+    Durations = event_duration.tolist()
+    for index in np.flatnonzero((start == -1) | (end == -1)).tolist():
+        Durations[index] = -1
+    StaffTimes = staff_time.tolist()
+    for index in np.flatnonzero((event_duration == -1) & (set_up_duration == -1) & (tear_down_duration == -1)).tolist():
+        StaffTimes[index] = 0
+
+    formatted = {duration: format_hours(duration) for duration in set(Durations)}
+    FormattedDurations = [formatted[duration] for duration in Durations]
+    return Durations, StaffTimes, FormattedDurations
+
+class SheetRows(list):
+    """Rows for one worksheet, kept as tuples until the dataset is saved."""
+
+    def append(self, row):
+        super().append(tuple(row))
+
+    def extend(self, rows):
+        super().extend(map(tuple, rows))
+
+class DatasetBuffer:
+    """
+    The worksheets of a dataset, used like an openpyxl Workbook (wb["EventProgram"].append(row)).
+    Rows are buffered as compact tuples and streamed into a write-only workbook on save,
+    so no cell objects are kept in memory while the CSV is read.
+    """
+
+    def __init__(self, workbook_setup):
+        self.sheets = {}
+        for sheet_name, headers in workbook_setup.items():
+            self.sheets[sheet_name] = SheetRows()
+            self.sheets[sheet_name].append(headers)
+
+    def __getitem__(self, sheet_name):
+        return self.sheets[sheet_name]
+
+    def replace_sheet(self, sheet_name, headers, rows):
+        """Replace (or add) a worksheet with new headers and rows."""
+        self.sheets[sheet_name] = SheetRows()
+        self.sheets[sheet_name].append(headers)
+        self.sheets[sheet_name].extend(rows)
+
+    @property
+    def sheetnames(self):
+        return list(self.sheets)
+
+    def save(self, filename):
+        wb = Workbook(write_only=True)
+        for sheet_name, rows in self.sheets.items():
+            ws = wb.create_sheet(title=sheet_name)
+            for row in rows:
+                ws.append(row)
+        wb.save(filename)
+
+    def close(self):
+        pass
+
 def create_dataset_template():
-    # Create a Workbook
-    wb = Workbook()
 
     # Give the Workbook The Following Worksheets
     workbook_setup = {  "EventInformation": [ "EventID", "Title", "Description", "Location", "Library Branch",
@@ -313,20 +571,10 @@ def create_dataset_template():
                         "EventProgram": ["EventID", "Program Type"]
                      }
 
-    # remove the first sheet
-    wb.remove(wb["Sheet"])
-
     # Add Worksheets and Headers
-    for sheet_name, headers in workbook_setup.items():
-        ws = wb.create_sheet(title=sheet_name)
-        ws.append(headers)
-    
-    return wb
+    return DatasetBuffer(workbook_setup)
 
 def create_matrix_map_settings():
-    # Create a Workbook
-    wb = Workbook()
-
     # Give the Workbook The Following Worksheets (avg)
     workbook_setup = {  "Program Options": [ "Program Type", "Cost Score", "Impact Score", 
                                                       "Connection and Belonging", "Trust", "Access", "Community Reach", "Creativity and Joy", "Strategic Fit", "Recommended Impact Score", 
@@ -341,201 +589,371 @@ def create_matrix_map_settings():
                                               "Cost Recovery / Net Cost", "Resource Intensity", "Scaling Difficulty", "Funding Dependency", "Operational Complexity", "Recommended Cost Score"],
                      }
 
-    # remove the first sheet
-    wb.remove(wb["Sheet"])
-
     # Add Worksheets and Headers
-    for sheet_name, headers in workbook_setup.items():
-        ws = wb.create_sheet(title=sheet_name)
-        ws.append(headers)
-    
-    return wb
+    return DatasetBuffer(workbook_setup)
 
-def find_data_source_file():
-    # Search for the CSV file in the current directory
+def find_data_source_files():
+    # Search for the CSV files in the current directory, newest first
     # Pattern: starts with "lc_events_"
     csv_files = [f for f in os.listdir('.') if re.match(r'lc_events_.*\.csv$', f)]
     if not csv_files:
         print("No lc_events_*.csv file found in the current directory.")
         print("Could not update Matrix Map Dataset.")
         exit(1)
-    else:
-        print(f"Found data source file: {csv_files[0]}")
-    return csv_files[0]
 
-def read_csv_and_populate_workbook(wb, source_file):
-    LocationSet = set()
-    CategorySet = set()
-    AudienceSet = set()
-    InternalTagSet = set()
-    BranchSet = set()
-    FiscalYearSet = set()
+    csv_files.sort(key=lambda f: (os.path.getmtime(f), f), reverse=True)
+    for csv_file in csv_files:
+        print(f"Found data source file: {csv_file}")
+    return csv_files
+
+# Columns copied straight from each CSV row into EventInformation and EventParticipation
+EVENT_INFORMATION_COLUMNS = itemgetter(0, 1, 2, 9, 10, 11, 12, 13, 14, 16)
+EVENT_PARTICIPATION_COLUMNS = itemgetter(0, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27)
+
+def intern_event_values(events):
+    """
+    Share repeated CSV values between events (sys.intern), so each distinct branch, location, organizer, date, time,
+    count, and the title and description of a recurring event, is kept in memory once until the dataset is saved.
+    Only the columns that reach the dataset are interned; EventIDs are unique.
+    """
+    for row in events:
+        row[1:15] = map(intern, row[1:15])
+        row[16] = intern(row[16])
+        row[18:28] = map(intern, row[18:28])
+
+def split_list_column(EventIDs, values):
+    """Split comma-separated values into (EventID, value) rows, one per listed value."""
+    return [(EventID, intern(value.strip())) for EventID, joined in zip(EventIDs, values) for value in joined.split(",")]
+
+def parse_event_batch(rows):
+    """Turn a batch of CSV rows into the rows for each dataset worksheet, column by column."""
+    # Skip events that were cancelled
+    events = [row for row in rows if "cancel" not in row[1].lower()]
+    if not events:
+        return {}
+
+    intern_event_values(events)
+
+    EventIDs = [row[0] for row in events]
+    EventStartDates = [row[3] for row in events]
+    EventEndDates = [row[4] for row in events]  # *Not included to reduce unnecessary dataset size
+
+    DifferentDates = [start != end for start, end in zip(EventStartDates, EventEndDates)]
+
+    StartTimes = [row[5] for row in events]      # Always Required
+    EndTimes = [row[6] for row in events]        # Sometimes Blank, if StartTime is "All Day Event"
+    SetUpTimes = [row[7] for row in events]      # Sometimes Blank
+    TearDownTimes = [row[8] for row in events]   # Sometimes Blank
+
+    AllDayEvents = [StartTime == "All Day Event" for StartTime in StartTimes]
+    StartTimes = ["00:00" if AllDayEvent else StartTime for StartTime, AllDayEvent in zip(StartTimes, AllDayEvents)]
+
+    # Duration is -1 if no valid StartTime or EndTime
+    Durations, StaffTimes, FormattedDurations = compute_event_times(StartTimes, EndTimes, SetUpTimes, TearDownTimes)
+
+    classify_start = perf_counter()
+    Programs = [get_program_names(row[1], [category.strip() for category in row[14].split(",")]) for row in events]
+    if CLASSIFIER_PROFILE:
+        profile_classification(events, Programs, perf_counter() - classify_start)
+
+    # Description, EventEndDate, PublishingStatus (always "Published"), EventNote and EventURL
+    # are left out of the smaller tables to reduce unnecessary dataset size
+    AudienceRows = split_list_column(EventIDs, [row[13] for row in events])
+    CategoryRows = split_list_column(EventIDs, [row[14] for row in events])
+    InternalTagRows = split_list_column(EventIDs, [row[16] for row in events])
+
+    ProgramRows = [(EventID, program) for EventID, programs in zip(EventIDs, Programs) for program in programs]
+
+    return {
+        "EventInformation": [EVENT_INFORMATION_COLUMNS(row) for row in events],
+        "EventAudiences": AudienceRows,
+        "EventCategories": CategoryRows,
+        "EventInternalTags": InternalTagRows,
+        "EventTimes": list(zip(EventIDs, EventStartDates, EventEndDates, AllDayEvents, StartTimes, EndTimes,
+                               SetUpTimes, TearDownTimes, Durations, StaffTimes, FormattedDurations, DifferentDates)),
+        "EventParticipation": [EVENT_PARTICIPATION_COLUMNS(row) for row in events],
+        "EventProgram": ProgramRows,
+    }
 
+def parse_event_file(source_file, skip_ids=frozenset()):
+    """
+    Parse one export into its rows for each dataset worksheet, leaving out events listed in skip_ids.
+    Also returns the EventIDs in the file (cancelled events included), so older exports can skip them.
+    """
     with open(source_file, newline="", encoding="utf-8") as f:
         reader = csv.reader(f)
-        for row in reader:
-            # Skip header row
-            if reader.line_num == 1:
-                continue
-
-            EventID = row[0]
-            Title = row[1]
-
-            # Skip events that were cancelled
-            if "cancel" in Title.lower():
-                continue
-            
-            Description = row[2] #*Not included to reduce unnecessary dataset size
-            EventStartDate = row[3]
-
-            Year = EventStartDate.split("-")[0]
-            FiscalYear = "FY " + Year + "-" + str((int(Year) + 1) % 100)
-            FiscalYearSet.add(FiscalYear)
-
-            EventEndDate = row[4] # *Not included to reduce unnecessary dataset size
-
-            DifferentDates = (EventStartDate != EventEndDate)
-            
-            StartTime = row[5]      # Always Required
-            EndTime = row[6]        # Sometimes Blank, if StartTime is "All Day Event"
-            SetUpTime = row[7]      # Sometimes Blank
-            TearDownTime = row[8]   # Sometimes Blank
-
-            AllDayEvent = (StartTime == "All Day Event")
-            if AllDayEvent:
-                StartTime = "00:00"
-
-            Duration = calculate_duration(StartTime, EndTime) # Duration is -1 if no valid StartTime or EndTime
-            StaffTime = calculate_event_staff_time(StartTime, EndTime, SetUpTime, TearDownTime)
-
-            FormattedDuration = format_hours(Duration)
-
-            Location = row[9]
-            LocationSet.add(Location)
-
-            LibraryBranch = row[10]
-            BranchSet.add(LibraryBranch)
-
-            EventOrganizer = row[11]
-            Presenter = row[12]
-            Audiences = row[13]
-            AudiencesList = [audience.strip() for audience in Audiences.split(",")]
-
-            Categories = row[14]
-            CategoriesList = [category.strip() for category in Categories.split(",")]
-
-            # PublishingStatus = row[15] *Always set to "Published" Not included to reduce unnecessary dataset size
-            InternalTags = row[16]
-            InternalTagsList = [tag.strip() for tag in InternalTags.split(",")]
-            # EventNote = row[17] *Not included to reduce unnecessary dataset size
-            RegistrationRequired = row[18]
-            InPersonSeats = row[19]
-            OnlineSeats = row[20]
-            ConfirmedRegistrations = row[21]
-            WaitlistRegistrations = row[22]
-            CancelledRegistrations = row[23]
-            AnticipatedAttendance = row[24]
-            ActualAttendance_InPerson = row[25]
-            ActualAttendance_Online = row[26]
-            ConfirmedAttendance = row[27]
-            # EventURL = row[28] *Not included to reduce unnecessary dataset size
-
-            # Add to Event Information Table
-            ws = wb["EventInformation"]
-            ws.append([EventID, Title, Description, Location, LibraryBranch, EventOrganizer, Presenter, Audiences, Categories, InternalTags])
-
-            # Add to Event Audiences Table
-            ws = wb["EventAudiences"]
-            for audience in AudiencesList:
-                ws.append([EventID, audience])
-
-            for audience in set(AudiencesList):
-                if audience not in AudienceSet:
-                    AudienceSet.add(audience)
-
-            # Add to Event Categories Table
-            ws = wb["EventCategories"]
-            for category in CategoriesList:
-                ws.append([EventID, category])
-
-            for category in set(CategoriesList):
-                if category not in CategorySet:
-                    CategorySet.add(category)
-
-            # Add to Event Internal Tags Table
-            ws = wb["EventInternalTags"]
-            for tag in InternalTagsList:
-                ws.append([EventID, tag])
-
-            for tag in set(InternalTagsList):
-                if tag not in InternalTagSet:
-                    InternalTagSet.add(tag)
-
-            # Add to Event Times Table
-            ws = wb["EventTimes"]
-            ws.append([EventID, EventStartDate, EventEndDate, AllDayEvent, StartTime, EndTime, SetUpTime, TearDownTime, Duration, StaffTime, FormattedDuration, DifferentDates])
-
-            # Add to Event Participation Table
-            ws = wb["EventParticipation"]
-            ws.append([EventID, RegistrationRequired, InPersonSeats, OnlineSeats, ConfirmedRegistrations, 
-                       WaitlistRegistrations, CancelledRegistrations, AnticipatedAttendance, ActualAttendance_InPerson, 
-                       ActualAttendance_Online, ConfirmedAttendance])
-            
-            # Add to Event Program Table
-            classify_event_program_by_title(wb, EventID, Title, CategoriesList)
+        # Skip header row
+        next(reader, None)
 
-    # If needed, create Matrix Map Settings:
-    # This Excel Worksheet allows the Users of the Matrix map to specify how they want to calculate the Impact and Cost
-    if not os.path.exists("Matrix Map Settings.xlsx"):
-        wb2 = create_matrix_map_settings()
+        return parse_event_rows(reader, skip_ids)
 
-        for category in CategorySet:
-            ws = wb2["Category Options"]
-            if category:
-                ws.append([category])
+def parse_event_rows(reader, skip_ids=frozenset()):
+    """Parse CSV records in batches of CSV_CHUNK_SIZE, returning the rows for each worksheet and the EventIDs read."""
+    tables = {}
+    file_ids = set()
 
-        for audience in AudienceSet:
-            ws = wb2["Audience Options"]
-            ws.append([audience])
+    while True:
+        rows = list(islice(reader, CSV_CHUNK_SIZE))
+        if not rows:
+            break
+        # Blank records are skipped after the end-of-file check, so a chunk of only blank lines doesn't end the read
+        rows = [row for row in rows if row]
 
-        programs = ["Story Time","Entertainment","Makerspace and Workshop",
-                    "Fitness and Wellness","Tech Support","Language and Culture",
-                    "Music and Film","Book Club","Discovery Center",
-                    "Life Skills and Community Resource","Nature and Home","Local History & Archives",
-                    "Genealogy Services","Important Meeting","Reader's Advisory"]
-        
-        for program in programs:
-            ws = wb2["Program Options"]
-            ws.append([program])
+        batch_ids = [row[0] for row in rows]
+        if skip_ids:
+            rows = [row for row, EventID in zip(rows, batch_ids) if EventID not in skip_ids]
+        file_ids.update(batch_ids)
 
-        wb2.save("Matrix Map Settings.xlsx")
-        wb2.close()
+        for sheet_name, sheet_rows in parse_event_batch(rows).items():
+            tables.setdefault(sheet_name, []).extend(sheet_rows)
 
-    # close file
-    f.close()
+    return tables, file_ids
 
-from openpyxl import load_workbook
+def read_to_record_start(f, quote_count):
+    """
+    Move f just past the next newline that ends a CSV record, returning the number of quote characters read so far.
+    A newline inside a quoted field always follows an odd number of quotes (doubled "" escapes count twice).
+    """
+    while True:
+        block_start = f.tell()
+        block = f.read(65536)
+        if not block:
+            return quote_count
+
+        start = 0
+        newline = block.find(b"\n")
+        while newline != -1:
+            quote_count += block.count(b'"', start, newline)
+            start = newline + 1
+            if quote_count % 2 == 0:
+                f.seek(block_start + start)
+                return quote_count
+            newline = block.find(b"\n", start)
+        quote_count += block.count(b'"', start)
+
+def find_shard_boundaries(source_file, shard_size):
+    """
+    Return the byte offsets splitting an export into shards of about shard_size bytes, from the end of the
+    header row to the end of the file. Every offset is the start of a CSV record.
+    """
+    file_size = os.path.getsize(source_file)
+    boundaries = []
+
+    with open(source_file, 'rb') as f:
+        # The first boundary is the end of the header row
+        quote_count = read_to_record_start(f, 0)
+        boundaries.append(f.tell())
 
-def create_simple_map():
-    wb = load_workbook("Matrix Map Dataset.xlsx", data_only=True)
+        while f.tell() < file_size:
+            # Count the quotes up to the next target offset, then move on to the next record
+            quote_count += f.read(shard_size).count(b'"')
+            quote_count = read_to_record_start(f, quote_count)
+            boundaries.append(f.tell())
 
+    return boundaries
+
+def parse_event_shard(source_file, start, end):
+    """parse_event_file for the records between two byte offsets of an export."""
+    with open(source_file, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    return parse_event_rows(csv.reader(io.StringIO(text, newline="")))
+
+def parse_sharded_event_files(source_files):
+    """
+    Parse exports for SHARDED_INGESTION, every shard of every export in a worker process,
+    yielding each export's tables and EventIDs in file order.
+    """
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        file_shards = []
+        for source_file in source_files:
+            boundaries = find_shard_boundaries(source_file, SHARD_SIZE)
+            file_shards.append([executor.submit(parse_event_shard, source_file, start, end)
+                                for start, end in zip(boundaries, boundaries[1:])])
+
+        # Join each export's shards back together in file order
+        for shards in file_shards:
+            tables = {}
+            file_ids = set()
+            for shard in shards:
+                shard_tables, shard_ids = shard.result()
+                for sheet_name, sheet_rows in shard_tables.items():
+                    tables.setdefault(sheet_name, []).extend(sheet_rows)
+                file_ids |= shard_ids
+
+            yield tables, file_ids
+
+def parse_exports(source_files, seen_ids):
+    """
+    Parse exports in order, yielding each one's tables, its EventIDs and the EventIDs to drop from its tables.
+    seen_ids is the caller's set of EventIDs in newer exports, read as each export is yielded. An export parsed
+    here on its own already leaves those events out (None to drop), unless its rows go into the export cache,
+    which has to hold every event.
+    """
+    # The classifier profile lives in this process, so a profiled refresh always parses here
+    if SHARDED_INGESTION and not CLASSIFIER_PROFILE:
+        for tables, file_ids in parse_sharded_event_files(source_files):
+            yield tables, file_ids, frozenset(seen_ids)
+        return
+
+    if PARALLEL_INGESTION and not CLASSIFIER_PROFILE and len(source_files) > 1:
+        # Workers can't know which events newer exports contain, so duplicates are dropped afterwards
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for tables, file_ids in executor.map(parse_event_file, source_files):
+                yield tables, file_ids, frozenset(seen_ids)
+        return
+
+    for source_file in source_files:
+        if use_export_cache():
+            tables, file_ids = parse_event_file(source_file)
+            yield tables, file_ids, frozenset(seen_ids)
+        else:
+            tables, file_ids = parse_event_file(source_file, seen_ids)
+            yield tables, file_ids, None
+
+def parse_event_files(source_files):
+    """
+    Parse every export, newest first, yielding each file's tables and the EventIDs to drop from them.
+    Unchanged exports are loaded from the export cache; the rest are parsed and added to it.
+    """
+    cache_paths = find_export_cache_paths(source_files)
+    cached_exports = {source_file: load_cached_export(cache_path) for source_file, cache_path in cache_paths.items()}
+
+    seen_ids = set()
+    parsed_exports = parse_exports([source_file for source_file in source_files
+                                    if cached_exports.get(source_file) is None], seen_ids)
+    for source_file in source_files:
+        if cached_exports.get(source_file) is not None:
+            print(f"Unchanged: {source_file}")
+            tables, file_ids = cached_exports[source_file]
+            skip_ids = frozenset(seen_ids)
+        else:
+            tables, file_ids, skip_ids = next(parsed_exports)
+            if use_export_cache():
+                save_cached_export(cache_paths[source_file], tables, file_ids)
+
+        yield tables, skip_ids
+        seen_ids |= file_ids
+    parsed_exports.close()
+
+    if use_export_cache():
+        prune_export_cache(cache_paths.values())
+
+# Export cache fingerprints: {source file: (size, modified time, SHA-256 of its contents)}
+EXPORT_FINGERPRINTS_FILE = 'Export Fingerprints.pkl'
+
+def get_export_hash(source_file, fingerprints):
+    """Return the SHA-256 of an export, reusing the last refresh's hash when its size and modified time haven't changed."""
+    file_stat = os.stat(source_file)
+    fingerprint = fingerprints.get(source_file)
+    if fingerprint and fingerprint[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+        return fingerprint[2]
+
+    export_hash = hashlib.sha256()
+    with open(source_file, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            export_hash.update(block)
+    fingerprints[source_file] = (file_stat.st_size, file_stat.st_mtime_ns, export_hash.hexdigest())
+    return fingerprints[source_file][2]
+
+def use_export_cache():
+    """Return whether exports go through the export cache. Profiling the classifier skips it so every export is classified."""
+    return EXPORT_CACHE and not CLASSIFIER_PROFILE
+
+def find_export_cache_paths(source_files):
+    """Return the export cache file for each export's parsed rows, or {} when the export cache isn't used."""
+    if not use_export_cache():
+        return {}
+
+    fingerprints_path = os.path.join(EXPORT_CACHE_FOLDER, EXPORT_FINGERPRINTS_FILE)
+    fingerprints = {}
+    if os.path.exists(fingerprints_path):
+        try:
+            with open(fingerprints_path, 'rb') as f:
+                fingerprints = pickle.load(f)
+        except Exception as e:
+            print(f"Could not read {fingerprints_path}, every export will be hashed: {e}")
+
+    cache_paths = {}
+    for source_file in source_files:
+        key = f"{EXPORT_CACHE_VERSION}|{compile_program_rules().rules_hash}|{get_export_hash(source_file, fingerprints)}"
+        cache_paths[source_file] = os.path.join(EXPORT_CACHE_FOLDER,
+                                                hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pkl')
+
+    os.makedirs(EXPORT_CACHE_FOLDER, exist_ok=True)
+    with open(fingerprints_path, 'wb') as f:
+        pickle.dump({source_file: fingerprints[source_file] for source_file in source_files}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    return cache_paths
+
+def load_cached_export(cache_path):
+    """Return the cached (tables, EventIDs) of an export, or None if they aren't cached."""
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"Could not read {cache_path}, the export will be parsed again: {e}")
+        return None
+
+def save_cached_export(cache_path, tables, file_ids):
+    """Save an export's parsed tables and EventIDs to the export cache."""
+    temp_path = cache_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump((tables, file_ids), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+
+def prune_export_cache(cache_paths):
+    """Remove cached exports that this refresh didn't use (changed or removed exports, or old program rules)."""
+    keep = {os.path.basename(cache_path) for cache_path in cache_paths}
+    keep.add(EXPORT_FINGERPRINTS_FILE)
+    for filename in os.listdir(EXPORT_CACHE_FOLDER):
+        if filename not in keep:
+            os.remove(os.path.join(EXPORT_CACHE_FOLDER, filename))
+
+def get_fiscal_year(EventStartDate):
+    """
+    Return the October-September fiscal year label for an event start date, matching the dashboard's
+    'October YYYY - September YYYY' folders ('2024-10-05' -> 'FY 2024-25', '2025-03-01' -> 'FY 2024-25').
+    """
+    Year, Month = EventStartDate.split("-")[:2]
+    StartYear = int(Year) if int(Month) >= 10 else int(Year) - 1
+    return f"FY {StartYear}-{(StartYear + 1) % 100:02d}"
+
+def collect_event_values(wb):
+    """Return the locations, branches, audiences, categories, internal tags and fiscal years in the dataset."""
+    EventValues = {"Location": set(), "Category": set(), "Audience": set(),
+                   "InternalTag": set(), "Branch": set(), "FiscalYear": set()}
+
+    # Skip the header row of each worksheet
+    for row in islice(wb["EventInformation"], 1, None):
+        EventValues["Location"].add(row[3])
+        EventValues["Branch"].add(row[4])
+    EventValues["Audience"].update(row[1] for row in islice(wb["EventAudiences"], 1, None))
+    EventValues["Category"].update(row[1] for row in islice(wb["EventCategories"], 1, None))
+    EventValues["InternalTag"].update(row[1] for row in islice(wb["EventInternalTags"], 1, None))
+
+    EventValues["FiscalYear"].update(get_fiscal_year(EventStartDate)
+                                     for EventStartDate in set(row[1] for row in islice(wb["EventTimes"], 1, None)))
+
+    return EventValues
+
+def add_program_statistics(Program_Info, tables):
+    """
+    Add one export's EventProgram, EventParticipation and EventTimes rows to the Simple Map totals:
+    {ProgramType: [EventCount, TotalAttendance, ParticipationRate, TotalDuration, TotalStaffTime, AvgDuration, AvgStaffTime]}
+    """
     # Mapping from EventID to ProgramType
     EventID_To_Program = {}
-    ws = wb["EventProgram"]
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        EventID = row[0]
-        ProgramType = row[1]  # Assuming second column has ProgramType
+    for EventID, ProgramType in tables.get("EventProgram", []):
         if EventID not in EventID_To_Program:
             EventID_To_Program[EventID] = set()
         EventID_To_Program[EventID].add(ProgramType)
 
-    # Program statistics
-    Program_Info = {}
-    # {ProgramType: [EventCount, TotalAttendance, ParticipationRate, TotalDuration, TotalStaffTime, AvgDuration, AvgStaffTime]}
-
-    # Process EventParticipation sheet
-    ws = wb["EventParticipation"]
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    for row in tables.get("EventParticipation", []):
         EventID = row[0]
         if EventID not in EventID_To_Program:
             print(f"Warning: EventID {EventID} not found in EventID_To_Program mapping.")
@@ -552,27 +970,218 @@ def create_simple_map():
             Program_Info[Program][0] += 1  # EventCount
             Program_Info[Program][1] += Total_Attendance  # TotalAttendance
 
-    # Process EventTimes sheet
-    ws = wb["EventTimes"]
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    for row in tables.get("EventTimes", []):
         EventID = row[0]
         if EventID not in EventID_To_Program:
             print(f"Warning: EventID {EventID} not found in EventID_To_Program mapping.")
             continue
 
         for Program in EventID_To_Program[EventID]:
-
-            # In EventTimes loop
             Duration = float(row[8] or 0)
             StaffTime = float(row[9] or 0)
 
-
             if Program not in Program_Info:
                 Program_Info[Program] = [0, 0, 0, 0, 0, 0, 0]
 
             Program_Info[Program][3] += Duration  # TotalDuration
             Program_Info[Program][4] += StaffTime  # TotalStaffTime
 
+def load_dimension_keys():
+    """Load the {value set: {value: key}} maps saved by the last refresh, or empty maps if they can't be used."""
+    if not os.path.exists(DIMENSION_KEYS_FILE):
+        return {}
+
+    try:
+        with open(DIMENSION_KEYS_FILE, encoding='utf-8') as f:
+            saved = json.load(f)
+    except ValueError as e:
+        print(f"Could not read {DIMENSION_KEYS_FILE}, every dimension will be numbered again: {e}")
+        return {}
+
+    if saved.get('version') != DIMENSION_KEYS_VERSION:
+        return {}
+    return saved['keys']
+
+def assign_dimension_keys(value_keys, values):
+    """Keep the saved key of every known value and give new values (in sorted order) the next free keys."""
+    next_key = max(value_keys.values(), default=0) + 1
+    for value in sorted(values - value_keys.keys()):
+        value_keys[value] = next_key
+        next_key += 1
+    return value_keys
+
+def add_dimension_tables(wb, EventValues):
+    """
+    Number the audiences, categories, internal tags, branches and locations, save each list as a dimension worksheet
+    and swap the text in the event worksheets for those keys. Values keep the keys saved in DIMENSION_KEYS_FILE, so
+    a new category doesn't renumber the others. Keys of values no longer in the exports are kept and never reused.
+    """
+    # Value set: (dimension worksheet, key column, value column)
+    dimension_setup = {"Audience": ("Audiences", "AudienceKey", "Audience"),
+                       "Category": ("Categories", "CategoryKey", "Category"),
+                       "InternalTag": ("InternalTags", "InternalTagKey", "Internal Tag"),
+                       "Branch": ("Branches", "BranchKey", "Library Branch"),
+                       "Location": ("Locations", "LocationKey", "Location")}
+
+    keys = load_dimension_keys()
+    for value_name, (sheet_name, key_header, value_header) in dimension_setup.items():
+        values = EventValues[value_name]
+        keys[value_name] = assign_dimension_keys(keys.get(value_name, {}), values)
+        wb.replace_sheet(sheet_name, [key_header, value_header],
+                         sorted((key, value) for value, key in keys[value_name].items() if value in values))
+
+    with open(DIMENSION_KEYS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'version': DIMENSION_KEYS_VERSION, 'keys': keys}, f, indent=4, ensure_ascii=False)
+
+    # EventInformation keeps the keys of its location and branch; the comma-joined lists are covered by the bridges
+    LocationKeys, BranchKeys = keys["Location"], keys["Branch"]
+    wb.replace_sheet("EventInformation",
+                     ["EventID", "Title", "Description", "LocationKey", "BranchKey", "Event Organizer", "Presenter"],
+                     [(row[0], row[1], row[2], LocationKeys[row[3]], BranchKeys[row[4]], row[5], row[6])
+                      for row in islice(wb["EventInformation"], 1, None)])
+
+    for sheet_name, value_name, key_header in [("EventAudiences", "Audience", "AudienceKey"),
+                                               ("EventCategories", "Category", "CategoryKey"),
+                                               ("EventInternalTags", "InternalTag", "InternalTagKey")]:
+        value_keys = keys[value_name]
+        wb.replace_sheet(sheet_name, ["EventID", key_header],
+                         [(EventID, value_keys[value]) for EventID, value in islice(wb[sheet_name], 1, None)])
+
+def read_csv_and_populate_workbook(wb, source_files):
+    """Fill the dataset worksheets from every export and return the Program Statistics totals for the Simple Map."""
+    Program_Info = {}
+
+    for tables, skip_ids in parse_event_files(source_files):
+        if skip_ids:
+            tables = {sheet_name: [row for row in sheet_rows if row[0] not in skip_ids]
+                      for sheet_name, sheet_rows in tables.items()}
+        for sheet_name, sheet_rows in tables.items():
+            wb[sheet_name].extend(sheet_rows)
+        if CREATE_SIMPLE_MAP:
+            add_program_statistics(Program_Info, tables)
+
+    EventValues = collect_event_values(wb)
+    CategorySet = EventValues["Category"]
+    AudienceSet = EventValues["Audience"]
+
+    # If needed, create Matrix Map Settings:
+    # This Excel Worksheet allows the Users of the Matrix map to specify how they want to calculate the Impact and Cost
+    if not os.path.exists("Matrix Map Settings.xlsx"):
+        wb2 = create_matrix_map_settings()
+
+        for category in CategorySet:
+            ws = wb2["Category Options"]
+            if category:
+                ws.append([category])
+
+        for audience in AudienceSet:
+            ws = wb2["Audience Options"]
+            ws.append([audience])
+
+        programs = compile_program_rules().programs
+        
+        for program in programs:
+            ws = wb2["Program Options"]
+            ws.append([program])
+
+        wb2.save("Matrix Map Settings.xlsx")
+        wb2.close()
+
+    if DIMENSION_TABLES:
+        add_dimension_tables(wb, EventValues)
+
+    return Program_Info
+
+def split_dataset_by_fiscal_year(wb):
+    """
+    Split the dataset into one DatasetBuffer per fiscal year, placing every row by its event's start date.
+    Worksheets not keyed by EventID (the dimension tables) are shared by all years and returned separately.
+    """
+    EventID_To_FiscalYear = {row[0]: get_fiscal_year(row[1]) for row in islice(wb["EventTimes"], 1, None)}
+    event_sheets = {sheet_name: wb[sheet_name][0] for sheet_name in wb.sheetnames if wb[sheet_name][0][0] == "EventID"}
+
+    partitions = {}
+    for sheet_name in event_sheets:
+        for row in islice(wb[sheet_name], 1, None):
+            FiscalYear = EventID_To_FiscalYear[row[0]]
+            if FiscalYear not in partitions:
+                partitions[FiscalYear] = DatasetBuffer(event_sheets)
+            partitions[FiscalYear][sheet_name].append(row)
+
+    shared_sheets = {sheet_name: wb[sheet_name][0] for sheet_name in wb.sheetnames if sheet_name not in event_sheets}
+    shared = DatasetBuffer(shared_sheets) if shared_sheets else None
+    if shared:
+        for sheet_name in shared_sheets:
+            shared[sheet_name].extend(islice(wb[sheet_name], 1, None))
+
+    return partitions, shared
+
+def get_dataset_hash(wb):
+    """Hash the worksheet names and row values of a dataset, to tell whether a saved partition is still current."""
+    dataset_hash = hashlib.sha256()
+    for sheet_name in wb.sheetnames:
+        dataset_hash.update(repr(sheet_name).encode('utf-8'))
+        rows = wb[sheet_name]
+        for start in range(0, len(rows), CSV_CHUNK_SIZE):
+            dataset_hash.update(repr(rows[start:start + CSV_CHUNK_SIZE]).encode('utf-8'))
+    return dataset_hash.hexdigest()
+
+def load_partition_manifest():
+    """Load the fiscal-year workbooks listed by the last partitioned save, or an empty manifest."""
+    manifest_path = os.path.join(PARTITION_FOLDER, PARTITION_MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except ValueError as e:
+        print(f"Could not read {PARTITION_MANIFEST_FILE}, every fiscal year will be saved: {e}")
+        return {}
+
+    if manifest.get('version') != PARTITION_MANIFEST_VERSION:
+        return {}
+    return manifest['partitions']
+
+def save_partitioned_dataset(wb):
+    """Save each fiscal year's rows (and any dimension tables) to its own workbook, skipping those that haven't changed."""
+    os.makedirs(PARTITION_FOLDER, exist_ok=True)
+    old_partitions = load_partition_manifest()
+    partitions, shared = split_dataset_by_fiscal_year(wb)
+    if shared:
+        partitions["Dimensions"] = shared
+
+    new_partitions = {}
+    for name, partition in sorted(partitions.items()):
+        filename = "Matrix Map Dimensions.xlsx" if partition is shared else f"Matrix Map Dataset {name}.xlsx"
+        path = os.path.join(PARTITION_FOLDER, filename)
+        entry = {'file': filename, 'hash': get_dataset_hash(partition),
+                 'rows': {sheet_name: len(partition[sheet_name]) - 1 for sheet_name in partition.sheetnames}}
+
+        old_entry = old_partitions.get(name)
+        if old_entry and old_entry['file'] == filename and old_entry['hash'] == entry['hash'] and os.path.exists(path):
+            print(f"Unchanged: {filename}")
+        else:
+            partition.save(path)
+            print(f"Saved workbook as '{filename}'.")
+        new_partitions[name] = entry
+
+    # Remove workbooks for fiscal years that no longer have any events
+    for name, old_entry in old_partitions.items():
+        old_path = os.path.join(PARTITION_FOLDER, old_entry['file'])
+        if name not in new_partitions and os.path.exists(old_path):
+            os.remove(old_path)
+            print(f"Removed: {old_entry['file']}")
+
+    manifest = {'version': PARTITION_MANIFEST_VERSION, 'updated': datetime.now().isoformat(timespec='seconds'),
+                'partitions': new_partitions}
+    with open(os.path.join(PARTITION_FOLDER, PARTITION_MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+
+from openpyxl import load_workbook
+
+def create_simple_map(Program_Info):
+    """Save 'Simple Map.xlsx' from the Program Statistics totals returned by read_csv_and_populate_workbook."""
     # Create a Workbook
     new_wb = Workbook()
     # Give the Workbook The Following Worksheets (avg)
@@ -632,35 +1241,45 @@ def create_simple_map():
     
 
 def main():
-    # Step 1: Search for Data Source File 
-    source_file = find_data_source_file()
-    print(f"Using data source file: {source_file}")
+    # Step 1: Search for Data Source Files
+    source_files = find_data_source_files()
+    print(f"Using {len(source_files)} data source file(s), newest first.")
 
     # Step 2: Create Dataset Template
     wb = create_dataset_template()
     print(f"Created dataset template: {wb}")
 
     # Step 3: Check for Existing Dataset and delete it
-    if os.path.exists("Matrix Map Dataset.xlsx"):
+    if not PARTITIONED_OUTPUT and os.path.exists("Matrix Map Dataset.xlsx"):
         os.remove("Matrix Map Dataset.xlsx")
         print("Deleted existing dataset file.")
 
     # Step 4: Read CSV and Populate Workbook
-    read_csv_and_populate_workbook(wb, source_file)
+    load_classification_memo()
+    Program_Info = read_csv_and_populate_workbook(wb, source_files)
+    save_classification_memo()
+    save_classifier_profile()
     print("Populated workbook with data from CSV.")
 
-    # Step 5: Save the Workbook
-    wb.save("Matrix Map Dataset.xlsx")
-    print("Saved workbook as 'Matrix Map Dataset.xlsx'.")
+    # Step 5: Save the Workbook (or one workbook per fiscal year)
+    if PARTITIONED_OUTPUT:
+        save_partitioned_dataset(wb)
+    else:
+        wb.save("Matrix Map Dataset.xlsx")
+        print("Saved workbook as 'Matrix Map Dataset.xlsx'.")
 
     # Step 6: Close the workbook
     wb.close()
 
+    # Step 7: Create the Simple Map from the totals kept while reading the CSV
+    if CREATE_SIMPLE_MAP:
+        create_simple_map(Program_Info)
+        print("Saved workbook as 'Simple Map.xlsx'.")
+
 import time
 if __name__ == "__main__":
     start_time = time.time()
     main()
-    # create_simple_map()
     end_time = time.time()
     print(f"Finished in {end_time - start_time:.3f} seconds.")
     input("Press Enter to Close the Program:")
\ No newline at end of file